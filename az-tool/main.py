@@ -1,6 +1,7 @@
 import sys
 import ctypes
 import asyncio
+import multiprocessing
 import keyboard
 from qasync import QEventLoop
 from PyQt6.QtWidgets import QApplication, QLabel, QTabWidget, QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QPushButton, QSizePolicy, QCheckBox, QDialog
@@ -1787,4 +1788,6 @@ def main():
     #sys.exit(app.exec())
 
 if __name__ == "__main__":
+    # Needed for the collision geometry worker processes when running as a frozen executable
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
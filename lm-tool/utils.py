@@ -9,7 +9,7 @@ from wizwalker import ClientHandler, Client, XYZ
 from wizwalker.constants import Keycode, Primitive
 from wizwalker.memory.memory_objects.enums import WindowFlags
 
-from worlds_collide import WorldsCollideTP
+from worlds_collide import WorldsCollideTP, cancel_teleport_check, collision_prewarmer
 
 class Utils():
     def __init__(self):
@@ -98,12 +98,14 @@ class Utils():
 
     async def activate_hooks(self, client: Client): # TODO: rework logic and make this stop getting clients from get_open_clients
         await client.activate_hooks()
+        collision_prewarmer.watch(client)
         print(f"{client.title} hooks activated.")
 
     async def deactivate_hooks(self, client: Client): # TODO: rework logic and make this stop getting clients from get_open_clients
         hooked_window = (await client.root_window.get_windows_with_name('txtTestRealmText'))[0]
         await hooked_window.write_flags(WindowFlags.disabled)
 
+        collision_prewarmer.unwatch(client)
         await client.close()
         print(f"{client.title} hooks deactivated.")
 
@@ -154,6 +156,7 @@ class Utils():
     async def freecam_teleport(self, camera_pos: XYZ):
         client = self.foreground_client
         if client:
+            cancel_teleport_check(client)
             await client.teleport(camera_pos, wait_on_inuse=True, purge_on_after_unuser_fixer=True)
             print(f"{client.title} teleported to freecam position.")
 
@@ -164,6 +167,7 @@ class Utils():
 
             for teleporting_client in self.handler.get_ordered_clients():
                 if not teleporting_client is client:
+                    cancel_teleport_check(teleporting_client)
                     await teleporting_client.teleport(client_position)
 
     async def copy_position(self):
@@ -177,6 +181,7 @@ class Utils():
     async def handle_basic_teleport(self, location_x: float, location_y: float, location_z: float, yaw: float = None):
         client = self.foreground_client
         if client:
+            cancel_teleport_check(client)
             await client.teleport(XYZ(location_x, location_y, location_z), yaw)
 
     async def grab_item(self, entity_name: str):
@@ -210,6 +215,7 @@ class Utils():
                 await asyncio.sleep(0.1)
 
             if await client.body.position() != original_location:
+                cancel_teleport_check(client)
                 await client.teleport(original_location)
 
             print(f"{client.title} grabbed {entity_name}.")
@@ -1,26 +1,41 @@
+import os
+import re
+import sys
+import json
+import argparse
 import asyncio
+import hashlib
+import heapq
 import math
-from typing import List, Optional
+import time
+import threading
+import configparser
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Awaitable, Callable, Iterable, Iterator, List, Optional, TextIO
 from pathlib import Path
 
 from loguru import logger
 import numpy as np
 from memobj import WindowsProcess
 from wizwalker.memory import DynamicClientObject
-from shapely.geometry import Point, Polygon, MultiPolygon
+import shapely
+from shapely.geometry import Point, Polygon, MultiPolygon, box
 from shapely.ops import unary_union, nearest_points
+from shapely.strtree import STRtree
 
 from wizwalker import Client, XYZ
 from wizwalker.memory import Window
 from typing import TypeAlias
 
 import struct
-from dataclasses import dataclass, field
-from enum import Enum, Flag # We import Flag specifically for our CollisionFlag enum
-from io import BytesIO
+from dataclasses import dataclass, field, fields
+from fnmatch import fnmatch
+from enum import Enum, Flag, KEEP # We import Flag specifically for our CollisionFlag enum
 from pathlib import Path
 from typing import TypeAlias
-from xml.etree import ElementTree as etree
+from xml.sax.saxutils import escape
 from wizwalker import Wad, Client, XYZ
 
 Matrix3x3: TypeAlias = tuple[
@@ -34,21 +49,104 @@ Vector3D: TypeAlias = tuple[float, float, float]
 CubeVertices = tuple[Vector3D, Vector3D, Vector3D, Vector3D, Vector3D, Vector3D, Vector3D, Vector3D]
 
 
-class StructIO(BytesIO):
+class StructCache(dict):
+    """Format string -> compiled struct.Struct, compiled on first use."""
+    def __missing__(self, fmt: str) -> struct.Struct:
+        compiled = self[fmt] = struct.Struct(fmt)
+        return compiled
+
+
+compiled_structs = StructCache()
+
+
+class StructIO:
+    """
+    Sequential reader over a memoryview of the raw data. Formats are compiled once and decoded
+    in place with unpack_from, and reads hand back memoryview slices instead of copies.
+    """
+    def __init__(self, data: bytes | bytearray | memoryview = b""):
+        self._view = memoryview(data).cast("B")
+        self._offset = 0
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        if whence == 1:
+            offset += self._offset
+        elif whence == 2:
+            offset += len(self._view)
+        self._offset = offset
+        return self._offset
+
+    def getbuffer(self) -> memoryview:
+        return self._view
+
+    def read(self, size: int = -1) -> memoryview:
+        start = self._offset
+        end = len(self._view) if size < 0 else min(start + size, len(self._view))
+        self._offset = end
+        return self._view[start:end]
+
     def read_string(self) -> str:
         length, = self.unpack("<i")
-        return self.read(length).decode()
+        start = self._offset
+        self._offset += length
+        return str(self._view[start:self._offset], "utf-8")
 
     def unpack(self, fmt: str) -> tuple:
-        return struct.unpack(fmt, self.read(struct.calcsize(fmt)))
+        compiled = compiled_structs[fmt]
+        offset = self._offset
+        self._offset = offset + compiled.size
+        return compiled.unpack_from(self._view, offset)
 
 
-def flt(x: str) -> str:
-    x, y = str(round(x, 4)).split(".")
+def flt(x: float) -> str:
+    return f"{float(x):.4f}"
 
-    y = y.ljust(4, "0")
 
-    return f"{x}.{y}"
+class CollisionXMLWriter:
+    """
+    Writes collision XML to a text file one element at a time, indented two spaces per level like
+    ElementTree.indent, so exporting a zone never holds more than one chunk of elements in memory.
+    """
+    INDENT = "  "
+    # Escaped like ElementTree does it, so attributes are always double quoted
+    ATTRIBUTE_ENTITIES = {'"': "&quot;", "\n": "&#10;", "\r": "&#13;", "\t": "&#09;"}
+    # Rows of a bulk list (mesh vertices or faces) formatted per write
+    CHUNK_ROWS = 4096
+
+    def __init__(self, file: TextIO):
+        self.file = file
+        self.depth = 0
+
+    @staticmethod
+    def _tag(name: str, attributes: dict[str, str] = None) -> str:
+        if not attributes:
+            return name
+        entities = CollisionXMLWriter.ATTRIBUTE_ENTITIES
+        return name + "".join(f' {key}="{escape(str(value), entities)}"' for key, value in attributes.items())
+
+    def start(self, name: str, attributes: dict[str, str] = None):
+        self.file.write(f"{self.INDENT * self.depth}<{self._tag(name, attributes)}>\n")
+        self.depth += 1
+
+    def end(self, name: str):
+        self.depth -= 1
+        self.file.write(f"{self.INDENT * self.depth}</{name}>\n")
+
+    def empty(self, name: str, attributes: dict[str, str] = None):
+        self.file.write(f"{self.INDENT * self.depth}<{self._tag(name, attributes)} />\n")
+
+    def rows(self, name: str, keys: tuple[str, ...], rows: np.ndarray):
+        """One empty element per row with the row's values as attributes, floats written like flt()."""
+        value = "{:.4f}" if rows.dtype.kind == "f" else "{:d}"
+        row_format = f"{self.INDENT * self.depth}<{name}" + "".join(f' {key}="{value}"' for key in keys) + " />\n"
+        for start in range(0, len(rows), self.CHUNK_ROWS):
+            self.file.write("".join(row_format.format(*row) for row in rows[start:start + self.CHUNK_ROWS].tolist()))
 
 
 class ProxyType(Enum):
@@ -68,7 +166,7 @@ class ProxyType(Enum):
 # By inheriting from 'Flag', we create an enum where members can be combined using
 # bitwise operators (like OR, AND). This is perfect for representing things
 # like collision layers, where an object can be in multiple categories at once.
-class CollisionFlag(Flag):
+class CollisionFlag(Flag, boundary=KEEP):  # KEEP, so bits not named below (like 4) still decode
     # Bitwiz/Bitshift
     OBJECT = 1 << 0        # Value is 1
     WALKABLE = 1 << 1      # Value is 2
@@ -118,6 +216,21 @@ class CollisionFlag(Flag):
             return "CT_None"
 
 
+class FlagCache(dict):
+    """Raw bits -> CollisionFlag, built on first use. A zone only uses a handful of combinations."""
+    def __missing__(self, bits: int) -> CollisionFlag:
+        flag = self[bits] = CollisionFlag(bits)
+        return flag
+
+
+collision_flags = FlagCache()
+
+
+# WorldsCollideTP only needs solid geometry and floors, so objects that are nothing but
+# trigger, fog or water volumes are never decoded for it
+TELEPORT_CATEGORIES = ~(CollisionFlag.TRIGGER | CollisionFlag.FOG | CollisionFlag.WATER)
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 @dataclass
 class GeomParams:
@@ -127,9 +240,18 @@ class GeomParams:
     def from_stream(cls, stream: StructIO) -> "GeomParams":
         raise NotImplementedError(f"{cls.__name__}.from_stream() not implemented")
 
-    def save_xml(self, parent):
-        # stub for XML export if you ever need it
-        pass
+    def save_xml(self, writer: CollisionXMLWriter):
+        attributes = {param.name: flt(getattr(self, param.name)) for param in fields(self) if param.name != "proxy"}
+        if attributes:
+            writer.empty("params", attributes)
+
+    def values(self) -> tuple[float, ...]:
+        """Flat float parameters, used by the compiled on-disk cache."""
+        return ()
+
+    @classmethod
+    def from_values(cls, values) -> "GeomParams":
+        return cls(ProxyType.MESH)
 
 # BOX
 @dataclass
@@ -143,6 +265,13 @@ class BoxGeomParams(GeomParams):
         l, w, d = stream.unpack("<fff")
         return cls(ProxyType.BOX, l, w, d)
 
+    def values(self) -> tuple[float, ...]:
+        return (self.length, self.width, self.depth)
+
+    @classmethod
+    def from_values(cls, values) -> "BoxGeomParams":
+        return cls(ProxyType.BOX, values[0], values[1], values[2])
+
 # RAY
 @dataclass
 class RayGeomParams(GeomParams):
@@ -157,6 +286,13 @@ class RayGeomParams(GeomParams):
         o, dir_, length = stream.unpack("<fff")
         return cls(ProxyType.RAY, o, dir_, length)
 
+    def values(self) -> tuple[float, ...]:
+        return (self.origin_offset, self.direction_offset, self.length)
+
+    @classmethod
+    def from_values(cls, values) -> "RayGeomParams":
+        return cls(ProxyType.RAY, values[0], values[1], values[2])
+
 # SPHERE
 @dataclass
 class SphereGeomParams(GeomParams):
@@ -167,6 +303,13 @@ class SphereGeomParams(GeomParams):
         (r,) = stream.unpack("<f")
         return cls(ProxyType.SPHERE, r)
 
+    def values(self) -> tuple[float, ...]:
+        return (self.radius,)
+
+    @classmethod
+    def from_values(cls, values) -> "SphereGeomParams":
+        return cls(ProxyType.SPHERE, values[0])
+
 # CYLINDER
 @dataclass
 class CylinderGeomParams(GeomParams):
@@ -178,6 +321,13 @@ class CylinderGeomParams(GeomParams):
         r, l = stream.unpack("<ff")
         return cls(ProxyType.CYLINDER, r, l)
 
+    def values(self) -> tuple[float, ...]:
+        return (self.radius, self.length)
+
+    @classmethod
+    def from_values(cls, values) -> "CylinderGeomParams":
+        return cls(ProxyType.CYLINDER, values[0], values[1])
+
 # TUBE
 @dataclass
 class TubeGeomParams(GeomParams):
@@ -189,6 +339,13 @@ class TubeGeomParams(GeomParams):
         r, l = stream.unpack("<ff")
         return cls(ProxyType.TUBE, r, l)
 
+    def values(self) -> tuple[float, ...]:
+        return (self.radius, self.length)
+
+    @classmethod
+    def from_values(cls, values) -> "TubeGeomParams":
+        return cls(ProxyType.TUBE, values[0], values[1])
+
 # PLANE
 @dataclass
 class PlaneGeomParams(GeomParams):
@@ -200,6 +357,17 @@ class PlaneGeomParams(GeomParams):
         nx, ny, nz, d = stream.unpack("<ffff")
         return cls(ProxyType.PLANE, (nx, ny, nz), d)
 
+    def values(self) -> tuple[float, ...]:
+        return (*self.normal, self.distance)
+
+    def save_xml(self, writer: CollisionXMLWriter):
+        nx, ny, nz = self.normal
+        writer.empty("params", {"nx": flt(nx), "ny": flt(ny), "nz": flt(nz), "distance": flt(self.distance)})
+
+    @classmethod
+    def from_values(cls, values) -> "PlaneGeomParams":
+        return cls(ProxyType.PLANE, (values[0], values[1], values[2]), values[3])
+
 # MESH
 @dataclass
 class MeshGeomParams(GeomParams):
@@ -208,6 +376,31 @@ class MeshGeomParams(GeomParams):
     def from_stream(cls, stream: StructIO) -> "MeshGeomParams":
         return cls(ProxyType.MESH)
 
+    @classmethod
+    def from_values(cls, values) -> "MeshGeomParams":
+        return cls(ProxyType.MESH)
+
+# Size in bytes of the parameter block after each proxy type, used to skip objects without decoding them
+PARAM_SIZES: dict[int, int] = {
+    ProxyType.BOX.value: 12,
+    ProxyType.RAY.value: 12,
+    ProxyType.SPHERE.value: 4,
+    ProxyType.CYLINDER.value: 8,
+    ProxyType.TUBE.value: 8,
+    ProxyType.PLANE.value: 16,
+    ProxyType.MESH.value: 0,
+}
+
+PARAMS_BY_PROXY: dict[ProxyType, type[GeomParams]] = {
+    ProxyType.BOX: BoxGeomParams,
+    ProxyType.RAY: RayGeomParams,
+    ProxyType.SPHERE: SphereGeomParams,
+    ProxyType.CYLINDER: CylinderGeomParams,
+    ProxyType.TUBE: TubeGeomParams,
+    ProxyType.PLANE: PlaneGeomParams,
+    ProxyType.MESH: MeshGeomParams,
+}
+
 # ──────────────────────────────────────────────────────────────────────────────
 
 @dataclass
@@ -224,9 +417,11 @@ class ProxyGeometry:
 
     def load(self, stream: StructIO) -> "ProxyGeometry":
         self.name     = stream.read_string()
-        self.rotation = stream.unpack("<fffffffff")
-        self.location = stream.unpack("<fff")
-        (self.scale,) = stream.unpack("<f")
+        # rotation (9 floats), location (3 floats) and scale are contiguous, decode them in one go
+        transform     = stream.unpack("<fffffffffffff")
+        self.rotation = transform[:9]
+        self.location = transform[9:12]
+        self.scale    = transform[12]
         self.material = stream.read_string()
         (ptype,)    = stream.unpack("<i")
         self.proxy   = ProxyType(ptype)
@@ -251,105 +446,251 @@ class ProxyGeometry:
 
         return self
 
+    def save_xml(self, writer: CollisionXMLWriter):
+        writer.start(self.proxy.xml_value, {
+            "name": self.name,
+            "category": self.category_flags.xml_value,
+            "collide": self.collide_flag.xml_value,
+            "material": self.material,
+            "scale": flt(self.scale),
+        })
+        x, y, z = self.location
+        writer.empty("location", {"x": flt(x), "y": flt(y), "z": flt(z)})
+        writer.empty("rotation", {f"m{i // 3}{i % 3}": flt(value) for i, value in enumerate(self.rotation)})
+        self.params.save_xml(writer)
+        self._save_xml_body(writer)
+        writer.end(self.proxy.xml_value)
+
+    def _save_xml_body(self, writer: CollisionXMLWriter):
+        pass
+
+
+# On disk every face is three vertex indices immediately followed by its normal
+FACE_RECORD_DTYPE = np.dtype([("face", "<i4", (3,)), ("normal", "<f4", (3,))])
+
 
 @dataclass
 class ProxyMesh(ProxyGeometry):
-    vertices: list[SimpleVert] = field(default_factory=list)
-    faces: list[SimpleFace] = field(default_factory=list)
-    normals: list[SimpleVert] = field(default_factory=list)
+    # vertices and normals are (N, 3) float32 arrays, faces are (M, 3) int32 arrays
+    vertices: np.ndarray = field(default_factory=lambda: np.zeros((0, 3), dtype=np.float32))
+    faces: np.ndarray = field(default_factory=lambda: np.zeros((0, 3), dtype=np.int32))
+    normals: np.ndarray = field(default_factory=lambda: np.zeros((0, 3), dtype=np.float32))
 
-    def load(self, stream: StructIO) -> None:
+    def load(self, stream: StructIO, normals: bool = True, faces: bool = True) -> None:
         vertex_count, face_count = stream.unpack("<ii") # gives the cords of the 3d shape
         # might only need 2D not 3D for what we are doing? (NavmapTP)
         # How many points (vertices) your 3D object has.
         # How many faces (triangles, usually) your object has.
-        for _ in range(vertex_count): #
-            self.vertices.append(stream.unpack("<fff"))
+        # Both sections are decoded in bulk straight from the stream's buffer, then copied
+        # into native arrays so the mesh does not keep the whole bcd alive. Faces and normals
+        # that the caller does not need are skipped over instead of copied.
+        buffer = stream.getbuffer()
+        offset = stream.tell()
 
-        for _ in range(face_count):
-            self.faces.append(stream.unpack("<iii"))
-            self.normals.append(stream.unpack("<fff"))
+        vertices = np.frombuffer(buffer, dtype="<f4", count=vertex_count * 3, offset=offset)
+        self.vertices = vertices.reshape(vertex_count, 3).astype(np.float32)
+        offset += vertices.nbytes
 
-        super().load(stream)
+        records = np.frombuffer(buffer, dtype=FACE_RECORD_DTYPE, count=face_count, offset=offset)
+        if faces:
+            self.faces = records["face"].astype(np.int32)
+        if normals:
+            self.normals = records["normal"].astype(np.float32)
+        offset += records.nbytes
 
-    def save_xml(self, parent: etree.Element) -> etree.Element:
-        element = super().save_xml(parent)
+        stream.seek(offset)
 
-        mesh = etree.SubElement(element, "mesh")
+        super().load(stream)
 
-        vertexlist = etree.SubElement(
-            mesh,
-            "vertexlist",
-            {"size": str(len(self.vertices))},
-        )
-        for x, y, z in self.vertices:
-            etree.SubElement(
-                vertexlist,
-                "vert",
-                {"x": flt(x), "y": flt(y), "z": flt(z)},
-            )
+    def _save_xml_body(self, writer: CollisionXMLWriter):
+        writer.start("mesh")
+        writer.start("vertexlist", {"size": len(self.vertices)})
+        writer.rows("vert", ("x", "y", "z"), np.asarray(self.vertices))
+        writer.end("vertexlist")
+        writer.start("facelist", {"size": len(self.faces)})
+        writer.rows("face", ("a", "b", "c"), np.asarray(self.faces))
+        writer.end("facelist")
+        writer.end("mesh")
 
-        facelist = etree.SubElement(
-            mesh,
-            "facelist",
-            {"size": str(len(self.faces))},
-        )
-        for a, b, c in self.faces:
-            etree.SubElement(facelist, "face", {"a": str(a), "b": str(b), "c": str(c)})
 
-        return element
+class CollisionIndex:
+    """
+    First pass over raw collision data: the offset, proxy type and flag bits of every object, found by
+    skipping over each object's body without decoding it. Objects are then decoded one at a time, so
+    a loader only pays for the categories it asks for.
+    """
+    def __init__(self, raw_data: bytes | bytearray | memoryview):
+        self.stream = StructIO(raw_data)
+        view = self.stream.getbuffer()
+        header, length, mesh_counts = compiled_structs["<iII"], compiled_structs["<i"], compiled_structs["<ii"]
+
+        geometry_count, = self.stream.unpack("<i") # first bytes in the file is the geometry count
+        offsets, types, category_bits, collide_bits = [], [], [], []
+        name_lengths, transforms, material_lengths, proxies = [], [], [], []
+        meshes = []
+        offset = self.stream.tell()
+        for _ in range(geometry_count):
+            # category_bits and collide_bits are for Open Dynamics Engine
+            geometry_type, category, collide = header.unpack_from(view, offset)
+            offset += header.size
+            offsets.append(offset)
+            types.append(geometry_type)
+            category_bits.append(category)
+            collide_bits.append(collide)
+
+            # Meshes lead with their vertices (12 bytes each) and face records (24 bytes each)
+            if geometry_type == ProxyType.MESH.value:
+                vertex_count, face_count = mesh_counts.unpack_from(view, offset)
+                meshes.append((len(offsets) - 1, offset + mesh_counts.size, vertex_count, face_count))
+                offset += mesh_counts.size + vertex_count * 12 + face_count * 24
+            # name, then rotation, location and scale (13 floats), then material
+            name_length, = length.unpack_from(view, offset)
+            offset += 4 + name_length
+            transforms.append(offset)
+            material_length, = length.unpack_from(view, offset + 52)
+            offset += 56 + material_length
+            proxy, = length.unpack_from(view, offset)
+            if proxy not in PARAM_SIZES:
+                raise ValueError(f"Invalid proxy type: {proxy}")
+            offset += 4 + PARAM_SIZES[proxy]
+            name_lengths.append(name_length)
+            material_lengths.append(material_length)
+            proxies.append(proxy)
+
+        # Decoding reads the Python rows; the arrays are for selecting objects in bulk
+        self._rows = list(zip(offsets, types, category_bits, collide_bits))
+        self.offsets = np.array(offsets, dtype=np.int64)
+        self.types = np.array(types, dtype=np.int32)
+        self.category_bits = np.array(category_bits, dtype=np.uint32)
+        self.collide_bits = np.array(collide_bits, dtype=np.uint32)
+        # Field layout, for decoding every object's fields at once (see ColumnarWorld.from_raw): the name
+        # ends where the 13 transform floats start, and the material follows them
+        self.transforms = np.array(transforms, dtype=np.int64)
+        self.name_lengths = np.array(name_lengths, dtype=np.int64)
+        self.material_lengths = np.array(material_lengths, dtype=np.int64)
+        self.proxies = np.array(proxies, dtype=np.int32)
+        self.meshes = np.array(meshes, dtype=np.int64).reshape(-1, 4)  # (object, data start, vertices, faces)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def select(self, categories: CollisionFlag = None) -> np.ndarray:
+        """
+        Indices of every object except those whose category bits all lie in the categories the filter
+        leaves out. Objects with no category bits, or only bits CollisionFlag does not name, are kept.
+        """
+        if categories is None:
+            return np.arange(len(self))
+        excluded = (~categories).value
+        dropped = (self.category_bits != 0) & ((self.category_bits & ~np.uint32(excluded)) == 0)
+        return np.flatnonzero(~dropped)
+
+    def decode(self, index: int, normals: bool = True, faces: bool = True) -> ProxyGeometry:
+        # CollisionFlag is a Flag, so a value like 13379 becomes a combination such as
+        # OBJECT | WALKABLE | WATER | GOO | MUCK | TAR
+        offset, geometry_type, category_bits, collide_bits = self._rows[index]
+        category = collision_flags[category_bits]
+        collide = collision_flags[collide_bits]
+        self.stream.seek(offset)
+
+        if geometry_type == ProxyType.MESH.value: # MESH is often used for floors or complex terrain
+            geometry = ProxyMesh(category, collide)
+            geometry.load(self.stream, normals, faces)
+        else: # Other shapes like boxes, spheres, etc.
+            geometry = ProxyGeometry(category, collide)
+            geometry.load(self.stream)
+        return geometry
 
 
 @dataclass
 class CollisionWorld:
     objects: list[ProxyGeometry] = field(default_factory=list)
+    # What load() kept: the category filter (None for everything) and whether mesh normals and faces were decoded
+    categories: Optional[CollisionFlag] = None
+    normals: bool = True
+    faces: bool = True
+
+    def load(self, raw_data: bytes, categories: CollisionFlag = None, normals: bool = True, faces: bool = True) -> None:
+        """
+        Decodes every object except those only in categories outside the filter (see CollisionIndex.select).
+        Mesh normals and faces can be skipped when only vertices, hulls or slices are needed.
+        """
+        index = CollisionIndex(raw_data) # raw bytes for the whole file (mem stream)
+        self.categories, self.normals, self.faces = categories, normals, faces
+        self.objects.extend(index.decode(i, normals, faces) for i in index.select(categories).tolist())
+
+    def save_xml(self, path: str | Path) -> Path:
+        return save_world_xml(self.objects, path)
+
+
+def save_world_xml(objects: Iterable[ProxyGeometry], path: str | Path) -> Path:
+    """Streams the objects to an XML file as <world>, writing each object as soon as it is produced."""
+    path = Path(path)
+    path.parent.mkdir(exist_ok=True, parents=True)
+    with path.open("w", encoding="utf-8", newline="\n", buffering=1 << 20) as file:
+        file.write('<?xml version="1.0" encoding="utf-8" ?>\n')
+        writer = CollisionXMLWriter(file)
+        writer.start("world")
+        for obj in objects:
+            obj.save_xml(writer)
+        writer.end("world")
+    return path
+
+
+def _game_data_file(relative: str) -> Optional[Path]:
+    """A file in the configured game data directory, or None when there is no such file."""
+    if not collision_config["game_data_dir"]:
+        return None
+    path = Path(collision_config["game_data_dir"]) / relative
+    return path if path.is_file() else None
+
+
+def game_data_revision() -> str:
+    """The revision of the game data directory, read from the revision.dat copied into it."""
+    revision_file = _game_data_file("revision.dat")
+    return revision_file.read_text().strip() if revision_file else "unknown_revision"
+
+
+def game_data_zones() -> list[str]:
+    """Zone names that have a .wad file or an extracted folder in the game data directory."""
+    if not collision_config["game_data_dir"]:
+        return []
+    root = Path(collision_config["game_data_dir"])
+    names = {path.stem for path in root.glob("*.wad")}
+    names.update(path.parent.name for path in root.glob("*/collision.bcd"))
+    return sorted(name.replace("-", "/") for name in names)
+
+
+# Content hash of each game data file's collision.bcd, with the (mtime, size) it was hashed at
+_game_data_hashes: dict[Path, tuple[tuple[int, int], str]] = {}
+
+
+async def game_data_hash(zone_name: str) -> Optional[str]:
+    """
+    Content hash of a zone's collision.bcd in the game data directory, hashed again only when its file
+    changes, or None when collision is read from the game, whose bcd only changes with the revision.
+    """
+    name = zone_name.replace("/", "-")
+    source = _game_data_file(f"{name}/collision.bcd") or _game_data_file(f"{name}.wad")
+    if source is None:
+        return None
 
-    def load(self, raw_data: bytes) -> None:
-        stream = StructIO(raw_data) # raw bytes for the whole file (mem stream)
-
-        geometry_count, = stream.unpack("<i") # first bytes in the file is the geometry count
-        for _ in range(geometry_count): # for every object in the geometry file
-            # category_bits and collide_bits are for Open Dynamics Engine
-            # This next line reads raw integers from the binary file. These integers
-            # are the collision flags we need to interpret.
-            geometry_type, category_bits, collide_bits = stream.unpack("<iII")
-
-            # This is where the error happened. We pass an integer (like 13379) to the
-            # CollisionFlag enum. The enum then checks if all the bits in that integer
-            # correspond to defined flags. It failed because the bit for 8192 was set,
-            # but we hadn't defined a flag for it yet.
-            # Now that we have added UNKNOWN_13, this will succeed.
-            #
-            # For example, CollisionFlag(13379) will create a composite flag equivalent to:
-            # CollisionFlag.OBJECT | WALKABLE | WATER | GOO | MUCK | UNKNOWN_13
-            category = CollisionFlag(category_bits)
-            collide = CollisionFlag(collide_bits)
-
-            proxy = ProxyType(geometry_type)
-
-            if proxy == ProxyType.MESH: # MESH is often used for floors or complex terrain
-                geometry = ProxyMesh(category, collide)
-            else: # Other shapes like boxes, spheres, etc.
-                geometry = ProxyGeometry(category, collide)
-
-            geometry.load(stream)
-            self.objects.append(geometry)
-
-
-    def save_xml(self, path: str | Path) -> etree.Element:
-        world = etree.Element("world")
-        for obj in self.objects:
-            obj.save_xml(world)
-
-        etree.indent(world)
-        path.parent.mkdir(exist_ok=True, parents=True)
-        with path.open("w") as file:
-            file.write('<?xml version="1.0" encoding="utf-8" ?>\n')
-            file.write(etree.tostring(world, encoding="unicode", xml_declaration=False))
+    stat = source.stat()
+    version = (stat.st_mtime_ns, stat.st_size)
+    hashed = _game_data_hashes.get(source)
+    if hashed is None or hashed[0] != version:
+        raw = await get_collision_data(zone_name=zone_name)
+        hashed = _game_data_hashes[source] = (version, CollisionDiskCache.content_hash(raw))
+    return hashed[1]
 
 
 async def load_wad(path: str):
     if path is not None:
+        if collision_config["game_data_dir"]:
+            wad_file = _game_data_file(f"{path.replace('/', '-')}.wad")
+            if wad_file is None:
+                raise FileNotFoundError(f"No wad for {path} in {collision_config['game_data_dir']}")
+            return Wad(wad_file)
         return Wad.from_game_data(path.replace("/", "-"))
 
 
@@ -360,6 +701,11 @@ async def get_collision_data(client: Client = None, zone_name: str = None) -> by
     elif not zone_name and not client:
         raise Exception('Client and/or zone name not provided, cannot read collision.bcd.')
 
+    # An extracted wad folder in the game data directory is read as is
+    bcd_file = _game_data_file(f"{zone_name.replace('/', '-')}/collision.bcd")
+    if bcd_file is not None:
+        return await asyncio.to_thread(bcd_file.read_bytes)
+
     wad = await load_wad(zone_name)
     collision_data = await wad.get_file("collision.bcd")
 
@@ -397,13 +743,40 @@ def toMultidim(mat: Matrix3x3):
     )
 
 
+# Corner signs in the same order as toCubeVertices
+CUBE_CORNER_SIGNS = np.array([
+    (-1, -1, -1),
+    (1, -1, -1),
+    (1, -1, 1),
+    (-1, -1, 1),
+
+    (-1, 1, -1),
+    (1, 1, -1),
+    (1, 1, 1),
+    (-1, 1, 1),
+], dtype=np.float64)
+
+
+def toCubeVerticesBatch(dimensions: np.ndarray) -> np.ndarray:
+    """(N, 3) box dimensions -> (N, 8, 3) corners, matching toCubeVertices."""
+    return np.asarray(dimensions, dtype=np.float64)[:, None, :] / 2 * CUBE_CORNER_SIGNS
+
+
+def toMultidimBatch(rotations: np.ndarray) -> np.ndarray:
+    """(N, 9) rotations -> (N, 3, 3) matrices, transposed like toMultidim."""
+    return np.asarray(rotations, dtype=np.float64).reshape(-1, 3, 3).transpose(0, 2, 1)
+
+
+def transformPointsBatch(points: np.ndarray, locations: np.ndarray, rotations: np.ndarray) -> np.ndarray:
+    """
+    Applies transformCube to many point sets at once.
+    points is (N, K, 3), locations (N, 3) and rotations (N, 9); returns (N, K, 3).
+    """
+    return np.matmul(points, toMultidimBatch(rotations)) + np.asarray(locations, dtype=np.float64)[:, None, :]
+
+
 def transformCube(cube, location, rotation):
-    tpoints = [np.dot((p,), toMultidim(rotation))[0] for p in cube]
-    for p in tpoints:
-        p[0] += location[0]
-        p[1] += location[1]
-        p[2] += location[2]
-    return tpoints
+    return list(transformPointsBatch(np.asarray(cube, dtype=np.float64)[None], [location], [rotation])[0])
 
 
 async def get_window_from_path(root_window: Window, name_path: list[str]) -> Window:
@@ -440,17 +813,34 @@ async def is_free(client: Client):
     return not any([await client.is_loading(), await client.in_battle(), await is_visible_by_path(client, ['WorldView', 'wndDialogMain', 'btnRight'])])
 
 
+# Game revision per client. It cannot change while the client's game process runs, so revision.dat is read once
+_client_revisions: dict[Client, str] = {}
+
+
+def _read_revision() -> str:
+    if collision_config["game_data_dir"]:
+        # Collision is read from the game data directory, so caches are keyed on its revision
+        return game_data_revision()
+
+    process = WindowsProcess.from_name("WizardGraphicalClient.exe")
+    wiz_bin = Path(process.executable_path).parent
+    revision_file = wiz_bin / "revision.dat"
+
+    if not revision_file.exists():
+        raise FileNotFoundError(f"revision.dat not found in {wiz_bin}")
+
+    return revision_file.read_text().strip()
+
+
 async def get_revision_and_zone(client: Client) -> tuple[str, str]:
     """Get the revision and zone name from the client"""
     try:
-        process = WindowsProcess.from_name("WizardGraphicalClient.exe")
-        wiz_bin = Path(process.executable_path).parent
-        revision_file = wiz_bin / "revision.dat"
-
-        if not revision_file.exists():
-            raise FileNotFoundError(f"revision.dat not found in {wiz_bin}")
+        revision = _client_revisions.get(client)
+        if revision is None:
+            revision = _read_revision()
+            if revision != "unknown_revision":
+                _client_revisions[client] = revision
 
-        revision = revision_file.read_text().strip()
         zone_name = await client.zone_name()
         return revision, zone_name
     except Exception as e:
@@ -458,90 +848,2002 @@ async def get_revision_and_zone(client: Client) -> tuple[str, str]:
         return "unknown_revision", "unknown_zone"
 
 
-async def _load_and_build_collision_geometry(client: Client, z_slice: float) -> tuple[CollisionWorld, List[Polygon], List[Polygon]]:
-    """Loads raw collision data and builds 2D polygon shapes for static geometry."""
-    raw = await get_collision_data(client)
+def read_collision_config() -> dict:
+    """Reads the [Collision] section of config.ini, falling back to defaults."""
+    config_parser = configparser.ConfigParser()
+    config_parser.read("config.ini")
+
+    settings = {}
+    settings["cache_memory_mb"] = config_parser.getfloat("Collision", "cache_memory_mb", fallback=256.0)
+    settings["disk_cache"] = config_parser.getboolean("Collision", "disk_cache", fallback=True)
+    settings["cache_dir"] = config_parser.get("Collision", "cache_dir", fallback="collision_cache")
+    settings["windowed_free_area"] = config_parser.getboolean("Collision", "windowed_free_area", fallback=True)
+    # The window only grows by multiplying, so it has to start out positive
+    settings["search_radius"] = max(config_parser.getfloat("Collision", "search_radius", fallback=1000.0), 1.0)
+    settings["search_growth"] = max(config_parser.getfloat("Collision", "search_growth", fallback=2.0), 1.1)
+    settings["z_bucket_size"] = config_parser.getfloat("Collision", "z_bucket_size", fallback=25.0)
+    settings["walkable_below"] = config_parser.getfloat("Collision", "walkable_below", fallback=100.0)
+    settings["walkable_above"] = config_parser.getfloat("Collision", "walkable_above", fallback=100.0)
+    settings["entity_read_concurrency"] = max(config_parser.getint("Collision", "entity_read_concurrency", fallback=32), 1)
+    settings["prewarm"] = config_parser.getboolean("Collision", "prewarm", fallback=True)
+    settings["prewarm_interval"] = config_parser.getfloat("Collision", "prewarm_interval", fallback=1.0)
+    settings["geometry_process_pool"] = config_parser.getboolean("Collision", "geometry_process_pool", fallback=True)
+    settings["geometry_workers"] = max(config_parser.getint("Collision", "geometry_workers", fallback=1), 1)
+    settings["union_tiles"] = max(config_parser.getint("Collision", "union_tiles", fallback=4), 1)
+    settings["union_workers"] = max(config_parser.getint("Collision", "union_workers", fallback=0), 0)
+    settings["safe_point_mode"] = config_parser.get("Collision", "safe_point_mode", fallback="geometry").strip().lower()
+    settings["grid_cell_size"] = max(config_parser.getfloat("Collision", "grid_cell_size", fallback=8.0), 0.5)
+    settings["navigation"] = config_parser.getboolean("Collision", "navigation", fallback=True)
+    settings["nav_node_size"] = config_parser.getfloat("Collision", "nav_node_size", fallback=40.0)
+    settings["nav_hop_distance"] = max(config_parser.getfloat("Collision", "nav_hop_distance", fallback=500.0), 1.0)
+    settings["snap_to_floor"] = config_parser.getboolean("Collision", "snap_to_floor", fallback=True)
+    settings["floor_step_up"] = config_parser.getfloat("Collision", "floor_step_up", fallback=30.0)
+    # A fraction of the player radius, see ZoneCollision.slice_at
+    settings["simplify_tolerance"] = max(config_parser.getfloat("Collision", "simplify_tolerance", fallback=0.0), 0.0)
+    settings["filter_categories"] = config_parser.getboolean("Collision", "filter_categories", fallback=True)
+    settings["game_data_dir"] = config_parser.get("Collision", "game_data_dir", fallback="").strip()
+    return settings
+
+
+class CollisionCache:
+    """
+    In-process LRU cache of parsed zone collision (ZoneCollision), keyed by (revision, zone name).
+    Entries are evicted least recently used first once the memory budget is exceeded.
+    """
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, str], tuple["ZoneCollision", int]] = OrderedDict()
+        self._current_bytes = 0
+
+    @property
+    def current_bytes(self) -> int:
+        return self._current_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        return key in self._entries
+
+    def get(self, key: tuple[str, str]) -> Optional["ZoneCollision"]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: tuple[str, str], zone: "ZoneCollision", nbytes: int = None):
+        """Adds or refreshes an entry. Re-putting an entry updates its size after slices were built."""
+        if nbytes is None:
+            nbytes = zone.nbytes
+
+        if key in self._entries:
+            self._current_bytes -= self._entries.pop(key)[1]
+
+        self._entries[key] = (zone, nbytes)
+        self._current_bytes += nbytes
+
+        # Always keep the newest entry, even if it alone is over budget
+        while self._current_bytes > self.max_bytes and len(self._entries) > 1:
+            evicted_key, (_, evicted_bytes) = self._entries.popitem(last=False)
+            self._current_bytes -= evicted_bytes
+            logger.debug(f"Evicted collision for {evicted_key} from cache ({evicted_bytes / 1e6:.1f} MB).")
+
+    def clear(self):
+        self._entries.clear()
+        self._current_bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "current_bytes": self._current_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+collision_config = read_collision_config()
+collision_cache = CollisionCache(int(collision_config["cache_memory_mb"] * 1024 * 1024))
+
+
+def _pack_strings(strings: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    encoded = [string.encode() for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(blob) for blob in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _unpack_strings(blob: np.ndarray, offsets: np.ndarray) -> list[str]:
+    data = blob.tobytes()
+    return [data[start:end].decode() for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+
+def _world_filter_header(world: CollisionWorld) -> dict:
+    """What a world was parsed with, as stored in the disk cache header."""
+    return {
+        # The left-out categories, as objects outside every category are still kept
+        "excluded_categories": (~world.categories).value if world.categories is not None else None,
+        "normals": world.normals,
+        "faces": world.faces,
+    }
+
+
+def world_to_arrays(world: CollisionWorld) -> dict[str, np.ndarray]:
+    """Flattens a CollisionWorld into the numpy arrays stored by the on-disk cache."""
+    count = len(world.objects)
+    arrays = {
+        "types": np.zeros(count, dtype=np.int32),
+        "category_bits": np.zeros(count, dtype=np.uint32),
+        "collide_bits": np.zeros(count, dtype=np.uint32),
+        "rotations": np.zeros((count, 9), dtype=np.float32),
+        "locations": np.zeros((count, 3), dtype=np.float32),
+        "scales": np.zeros(count, dtype=np.float32),
+        "params": np.zeros((count, 4), dtype=np.float32),
+    }
+
+    meshes = []
+    for i, obj in enumerate(world.objects):
+        arrays["types"][i] = obj.proxy.value
+        arrays["category_bits"][i] = obj.category_flags.value
+        arrays["collide_bits"][i] = obj.collide_flag.value
+        arrays["rotations"][i] = obj.rotation
+        arrays["locations"][i] = tuple(obj.location)
+        arrays["scales"][i] = obj.scale
+        values = obj.params.values()
+        arrays["params"][i, :len(values)] = values
+        if isinstance(obj, ProxyMesh):
+            meshes.append((i, obj))
+
+    arrays["name_blob"], arrays["name_offsets"] = _pack_strings([obj.name for obj in world.objects])
+    arrays["material_blob"], arrays["material_offsets"] = _pack_strings([obj.material for obj in world.objects])
+
+    arrays["mesh_objects"] = np.array([i for i, _ in meshes], dtype=np.int32)
+    arrays["mesh_vertex_offsets"] = np.zeros(len(meshes) + 1, dtype=np.int64)
+    arrays["mesh_face_offsets"] = np.zeros(len(meshes) + 1, dtype=np.int64)
+    np.cumsum([len(mesh.vertices) for _, mesh in meshes], out=arrays["mesh_vertex_offsets"][1:])
+    np.cumsum([len(mesh.faces) for _, mesh in meshes], out=arrays["mesh_face_offsets"][1:])
+    arrays["vertices"] = np.concatenate([mesh.vertices for _, mesh in meshes] or [np.zeros((0, 3))]).astype(np.float32)
+    arrays["faces"] = np.concatenate([mesh.faces for _, mesh in meshes] or [np.zeros((0, 3))]).astype(np.int32)
+    arrays["normals"] = np.concatenate([mesh.normals for _, mesh in meshes] or [np.zeros((0, 3))]).astype(np.float32)
+    return arrays
+
+
+def world_from_arrays(arrays: dict[str, np.ndarray]) -> CollisionWorld:
+    """Rebuilds a CollisionWorld from the arrays produced by world_to_arrays."""
+    return CollisionWorld(list(objects_from_arrays(arrays)))
+
+
+def objects_from_arrays(arrays: dict[str, np.ndarray]) -> Iterator[ProxyGeometry]:
+    """Yields the objects of the arrays produced by world_to_arrays one at a time."""
+    names = _unpack_strings(arrays["name_blob"], arrays["name_offsets"])
+    materials = _unpack_strings(arrays["material_blob"], arrays["material_offsets"])
+    mesh_slots = {int(obj_index): slot for slot, obj_index in enumerate(arrays["mesh_objects"].tolist())}
+
+    rows = zip(
+        arrays["types"].tolist(), arrays["category_bits"].tolist(), arrays["collide_bits"].tolist(),
+        arrays["rotations"].tolist(), arrays["locations"].tolist(), arrays["scales"].tolist(), arrays["params"].tolist(),
+    )
+    for i, (ptype, category_bits, collide_bits, rotation, location, scale, params) in enumerate(rows):
+        proxy = ProxyType(ptype)
+        category = collision_flags[category_bits]
+        collide = collision_flags[collide_bits]
+
+        if proxy == ProxyType.MESH:
+            geometry = ProxyMesh(category, collide)
+            slot = mesh_slots[i]
+            v0, v1 = arrays["mesh_vertex_offsets"][slot:slot + 2].tolist()
+            f0, f1 = arrays["mesh_face_offsets"][slot:slot + 2].tolist()
+            # Views into the memory-mapped file, nothing is copied until it is used
+            geometry.vertices = arrays["vertices"][v0:v1]
+            geometry.faces = arrays["faces"][f0:f1]
+            geometry.normals = arrays["normals"][f0:f1]
+        else:
+            geometry = ProxyGeometry(category, collide)
+
+        geometry.name = names[i]
+        geometry.material = materials[i]
+        geometry.rotation = tuple(rotation)
+        geometry.location = tuple(location)
+        geometry.scale = scale
+        geometry.proxy = proxy
+        geometry.params = PARAMS_BY_PROXY[proxy].from_values(params)
+        yield geometry
+
+
+def _gather_strings(data: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Packs the byte ranges into one blob with offsets, like _pack_strings, without slicing them one by one."""
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    positions = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+    return data[positions], offsets
+
+
+# Floats in the parameter block of each proxy type, indexed by ProxyType value
+PARAM_FLOATS = np.array([PARAM_SIZES.get(value, 0) // 4 for value in range(len(ProxyType))], dtype=np.int64)
+
+
+class ColumnarWorld:
+    """
+    A CollisionWorld stored as columns instead of objects: per object its proxy type, raw category and
+    collide bits, location, rotation, scale and parameters (as in GeomParams.values()) in contiguous
+    arrays, with the vertices, faces and normals of all meshes in shared pools sliced by per-mesh offsets.
+    Names and materials are packed into byte blobs.
+
+    This is the same layout as the compiled disk cache, so a cached zone maps straight into it, and the
+    slicing paths read the columns directly instead of walking Python objects.
+    """
+    def __init__(self, arrays: dict[str, np.ndarray], categories: CollisionFlag = None, normals: bool = True, faces: bool = True):
+        self.arrays = arrays
+        self.categories, self.normals, self.faces = categories, normals, faces
+
+        self.types = arrays["types"]
+        self.category_bits = arrays["category_bits"]
+        self.collide_bits = arrays["collide_bits"]
+        self.rotations = arrays["rotations"]
+        self.locations = arrays["locations"]
+        self.scales = arrays["scales"]
+        self.params = arrays["params"]
+
+        self.mesh_objects = arrays["mesh_objects"]
+        self.mesh_vertex_offsets = arrays["mesh_vertex_offsets"]
+        self.mesh_face_offsets = arrays["mesh_face_offsets"]
+        self.vertices = arrays["vertices"]
+        self.mesh_faces = arrays["faces"]
+        self.mesh_normals = arrays["normals"]
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in self.arrays.values())
+
+    @classmethod
+    def from_world(cls, world: CollisionWorld) -> "ColumnarWorld":
+        return cls(world_to_arrays(world), world.categories, world.normals, world.faces)
+
+    def save_xml(self, path: str | Path) -> Path:
+        """Streams the zone to XML, building each object only while it is written."""
+        return save_world_xml(objects_from_arrays(self.arrays), path)
+
+    def to_world(self) -> CollisionWorld:
+        """The object form, for code that walks CollisionWorld.objects."""
+        world = world_from_arrays(self.arrays)
+        world.categories, world.normals, world.faces = self.categories, self.normals, self.faces
+        return world
+
+    @classmethod
+    def from_raw(
+            cls,
+            raw_data: bytes,
+            categories: CollisionFlag = None,
+            normals: bool = True,
+            faces: bool = True
+    ) -> "ColumnarWorld":
+        """
+        Parses raw collision data straight into columns. After the index pass every fixed-size field is
+        gathered for all objects at once, so no per-object Python objects are created.
+        """
+        index = CollisionIndex(raw_data)
+        rows = index.select(categories)
+        data = np.frombuffer(raw_data, dtype=np.uint8)
+
+        transforms = data[index.transforms[rows, None] + np.arange(52)].view("<f4").reshape(-1, 13)
+        proxies = index.proxies[rows]
+        # Parameters follow the type, right after the material; the clip only matters for the last object
+        param_starts = index.transforms[rows] + 60 + index.material_lengths[rows]
+        params = data.take(param_starts[:, None] + np.arange(16), mode="clip").view("<f4").reshape(-1, 4).copy()
+        params[np.arange(4) >= PARAM_FLOATS[proxies][:, None]] = 0
+
+        arrays = {
+            "types": proxies,
+            "category_bits": index.category_bits[rows],
+            "collide_bits": index.collide_bits[rows],
+            "rotations": transforms[:, :9].copy(),
+            "locations": transforms[:, 9:12].copy(),
+            "scales": transforms[:, 12].copy(),
+            "params": params,
+        }
+        name_lengths = index.name_lengths[rows]
+        material_lengths = index.material_lengths[rows]
+        arrays["name_blob"], arrays["name_offsets"] = _gather_strings(data, index.transforms[rows] - name_lengths, name_lengths)
+        arrays["material_blob"], arrays["material_offsets"] = _gather_strings(data, index.transforms[rows] + 56, material_lengths)
+
+        # Mesh pools: one copy of each selected mesh's vertices, faces and normals
+        selected = np.zeros(len(index), dtype=bool)
+        selected[rows] = True
+        meshes = index.meshes[selected[index.meshes[:, 0]]]
+        row_of = np.cumsum(selected) - 1
+        vertices, mesh_faces, mesh_normals = [], [], []
+        for _, start, vertex_count, face_count in meshes.tolist():
+            vertices.append(np.frombuffer(raw_data, dtype="<f4", count=vertex_count * 3, offset=start).reshape(vertex_count, 3))
+            records = np.frombuffer(raw_data, dtype=FACE_RECORD_DTYPE, count=face_count, offset=start + vertex_count * 12)
+            if faces:
+                mesh_faces.append(records["face"])
+            if normals:
+                mesh_normals.append(records["normal"])
+
+        arrays["mesh_objects"] = row_of[meshes[:, 0]].astype(np.int32)
+        arrays["mesh_vertex_offsets"] = np.zeros(len(meshes) + 1, dtype=np.int64)
+        arrays["mesh_face_offsets"] = np.zeros(len(meshes) + 1, dtype=np.int64)
+        np.cumsum(meshes[:, 2], out=arrays["mesh_vertex_offsets"][1:])
+        if faces:
+            np.cumsum(meshes[:, 3], out=arrays["mesh_face_offsets"][1:])
+        arrays["vertices"] = np.concatenate(vertices or [np.zeros((0, 3))]).astype(np.float32)
+        arrays["faces"] = np.concatenate(mesh_faces or [np.zeros((0, 3))]).astype(np.int32)
+        arrays["normals"] = np.concatenate(mesh_normals or [np.zeros((0, 3))]).astype(np.float32)
+        return cls(arrays, categories, normals, faces)
+
+    def mesh_rows(self) -> np.ndarray:
+        """(object row, vertex start, vertex end, face start, face end) of every mesh."""
+        return np.stack([
+            self.mesh_objects.astype(np.int64),
+            self.mesh_vertex_offsets[:-1], self.mesh_vertex_offsets[1:],
+            self.mesh_face_offsets[:-1], self.mesh_face_offsets[1:],
+        ], axis=1)
+
+
+def _face_normals(vertices: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """Unit normals of the triangles, for meshes that were parsed without theirs."""
+    a, b, c = (vertices[faces[:, i]].astype(np.float64) for i in range(3))
+    normals = np.cross(b - a, c - a)
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    return (normals / np.where(lengths > 0, lengths, 1.0)).astype(np.float32)
+
+
+def world_to_bcd(world: "ColumnarWorld | CollisionWorld") -> bytes:
+    """
+    Serializes a world to the collision.bcd layout read by CollisionWorld.load: the object count, then per
+    object its type and flag bits, for meshes the vertex and face counts, vertices and face records, then
+    name, rotation, location, scale, material, the type again and its parameters.
+    Meshes parsed without normals are written with normals computed from their triangles.
+    """
+    world = _columnar(world)
+    if not world.faces and len(world.mesh_objects):
+        raise ValueError("Meshes parsed without faces cannot be written back")
+
+    header, length, mesh_counts = compiled_structs["<iII"], compiled_structs["<i"], compiled_structs["<ii"]
+    names, name_offsets = world.arrays["name_blob"].tobytes(), world.arrays["name_offsets"].tolist()
+    materials, material_offsets = world.arrays["material_blob"].tobytes(), world.arrays["material_offsets"].tolist()
+    transforms = np.concatenate([world.rotations, world.locations, world.scales[:, None]], axis=1).astype("<f4").tobytes()
+    params = world.params.astype("<f4").tobytes()
+    mesh_slots = {obj_index: slot for slot, obj_index in enumerate(world.mesh_objects.tolist())}
+    has_normals = world.normals and len(world.mesh_normals) == len(world.mesh_faces)
+
+    chunks = [length.pack(len(world))]
+    rows = zip(world.types.tolist(), world.category_bits.tolist(), world.collide_bits.tolist())
+    for i, (proxy, category_bits, collide_bits) in enumerate(rows):
+        chunks.append(header.pack(proxy, category_bits, collide_bits))
+        if proxy == ProxyType.MESH.value:
+            slot = mesh_slots[i]
+            v0, v1 = world.mesh_vertex_offsets[slot:slot + 2].tolist()
+            f0, f1 = world.mesh_face_offsets[slot:slot + 2].tolist()
+            vertices, faces = world.vertices[v0:v1], world.mesh_faces[f0:f1]
+            records = np.empty(f1 - f0, dtype=FACE_RECORD_DTYPE)
+            records["face"] = faces
+            records["normal"] = world.mesh_normals[f0:f1] if has_normals else _face_normals(vertices, faces)
+            chunks += [mesh_counts.pack(v1 - v0, f1 - f0), vertices.astype("<f4").tobytes(), records.tobytes()]
+
+        name = names[name_offsets[i]:name_offsets[i + 1]]
+        material = materials[material_offsets[i]:material_offsets[i + 1]]
+        chunks += [
+            length.pack(len(name)), name, transforms[i * 52:(i + 1) * 52],
+            length.pack(len(material)), material,
+            length.pack(proxy), params[i * 16:i * 16 + PARAM_SIZES[proxy]],
+        ]
+    return b"".join(chunks)
+
+
+def bcd_round_trip(raw_data: bytes) -> bool:
+    """True if parsing raw collision data and writing it back gives the same bytes, from both world forms."""
     world = CollisionWorld()
-    world.load(raw)
+    world.load(raw_data)
+    return world_to_bcd(world) == raw_data and world_to_bcd(ColumnarWorld.from_raw(raw_data)) == raw_data
+
+
+def synthetic_world(
+        boxes: int = 2000,
+        spheres: int = 500,
+        cylinders: int = 500,
+        meshes: int = 2,
+        mesh_triangles: int = 50000,
+        triggers: int = 0,
+        extent: float = 3000.0,
+        floor_spacing: float = 600.0,
+        seed: int = 0
+) -> ColumnarWorld:
+    """
+    A random zone for benchmarking without the game files. Primitives are scattered over +-extent around
+    the origin near the ground floor, and each mesh is a gently rolling walkable floor of about
+    mesh_triangles triangles, one every floor_spacing units up. Triggers are small trigger-only boxes,
+    for exercising category filtering.
+    """
+    rng = np.random.default_rng(seed)
+    kinds = (
+        ("box", ProxyType.BOX, CollisionFlag.OBJECT, boxes),
+        ("sphere", ProxyType.SPHERE, CollisionFlag.OBJECT, spheres),
+        ("cylinder", ProxyType.CYLINDER, CollisionFlag.OBJECT, cylinders),
+        ("trigger", ProxyType.BOX, CollisionFlag.TRIGGER, triggers),
+        ("floor", ProxyType.MESH, CollisionFlag.WALKABLE, meshes),
+    )
+    types = np.concatenate([np.full(count, proxy.value, dtype=np.int32) for _, proxy, _, count in kinds])
+    bits = np.concatenate([np.full(count, flag.value, dtype=np.uint32) for _, _, flag, count in kinds])
+    primitives = boxes + spheres + cylinders + triggers
+    count = primitives + meshes
+
+    locations = np.zeros((count, 3), dtype=np.float32)
+    locations[:primitives, :2] = rng.uniform(-extent, extent, (primitives, 2))
+    locations[:primitives, 2] = rng.uniform(-50, 150, primitives)
+
+    # Boxes turn about z; everything else keeps the identity
+    angles = np.zeros(count)
+    angles[:boxes] = rng.uniform(0, math.pi, boxes)
+    cos, sin = np.cos(angles), np.sin(angles)
+    zeros, ones = np.zeros(count), np.ones(count)
+    rotations = np.stack([cos, -sin, zeros, sin, cos, zeros, zeros, zeros, ones], axis=1).astype(np.float32)
+
+    params = np.zeros((count, 4), dtype=np.float32)
+    params[:boxes, :3] = rng.uniform((20, 20, 50), (200, 200, 300), (boxes, 3))
+    params[boxes:boxes + spheres, 0] = rng.uniform(20, 120, spheres)
+    params[boxes + spheres:boxes + spheres + cylinders, :2] = rng.uniform((100, 100), (800, 400), (cylinders, 2))
+    params[boxes + spheres + cylinders:primitives, :3] = 10
+
+    arrays = {
+        "types": types,
+        "category_bits": bits,
+        "collide_bits": bits.copy(),
+        "rotations": rotations,
+        "locations": locations,
+        "scales": np.ones(count, dtype=np.float32),
+        "params": params,
+    }
+    arrays["name_blob"], arrays["name_offsets"] = _pack_strings([f"{name}{i}" for name, _, _, n in kinds for i in range(n)])
+    arrays["material_blob"], arrays["material_offsets"] = _pack_strings(["synthetic"] * count)
+
+    # Every floor is the same grid of side cells, two triangles per cell
+    side = max(math.ceil(math.sqrt(mesh_triangles / 2)), 1)
+    grid = np.linspace(-extent - 500, extent + 500, side + 1)
+    xs, ys = np.meshgrid(grid, grid)
+    cells = (np.arange(side)[:, None] * (side + 1) + np.arange(side)).ravel()
+    faces = np.concatenate([
+        np.stack([cells, cells + 1, cells + side + 1], axis=1),
+        np.stack([cells + 1, cells + side + 2, cells + side + 1], axis=1),
+    ]).astype(np.int32)
+    floors = [
+        np.stack([xs.ravel(), ys.ravel(), floor * floor_spacing + np.sin(xs.ravel() / 500) * 5], axis=1).astype(np.float32)
+        for floor in range(meshes)
+    ]
+    arrays["mesh_objects"] = np.arange(primitives, count, dtype=np.int32)
+    arrays["mesh_vertex_offsets"] = np.arange(meshes + 1, dtype=np.int64) * len(xs.ravel())
+    arrays["mesh_face_offsets"] = np.arange(meshes + 1, dtype=np.int64) * len(faces)
+    arrays["vertices"] = np.concatenate(floors or [np.zeros((0, 3), dtype=np.float32)])
+    arrays["faces"] = np.concatenate([faces] * meshes or [np.zeros((0, 3), dtype=np.int32)])
+    arrays["normals"] = np.concatenate([_face_normals(vertices, faces) for vertices in floors] or [np.zeros((0, 3), dtype=np.float32)])
+    return ColumnarWorld(arrays)
+
+
+def _columnar(world: ColumnarWorld | CollisionWorld) -> ColumnarWorld:
+    return world if isinstance(world, ColumnarWorld) else ColumnarWorld.from_world(world)
+
+
+def _ranges(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Concatenation of arange(start, end) for every pair, without a Python loop."""
+    lengths = ends - starts
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    return np.repeat(starts - offsets, lengths) + np.arange(lengths.sum())
+
+
+class CollisionDiskCache:
+    """
+    Persists compiled zone collision as flat numpy arrays in a single memory-mappable file.
+
+    Files live at <cache_dir>/<revision>/<zone>-<bcd hash>.wcc. Directories for any other
+    revision are removed the first time a revision is used, so a game patch invalidates everything.
+    The file starts with MAGIC, a little-endian uint32 header length and a JSON header describing
+    where each array sits; arrays are 64-byte aligned so they can be viewed straight out of np.memmap.
+    """
+    MAGIC = b"WCC1"
+    ALIGNMENT = 64
+
+    def __init__(self, cache_dir: str | Path):
+        self.cache_dir = Path(cache_dir)
+        self._pruned_revisions: set[str] = set()
+
+    @staticmethod
+    def _safe_name(name: str) -> str:
+        return "".join(c if c.isalnum() or c in "-_." else "-" for c in name.replace("/", "-"))
+
+    @staticmethod
+    def content_hash(raw_data: bytes) -> str:
+        return hashlib.blake2b(raw_data, digest_size=16).hexdigest()
+
+    def _revision_dir(self, revision: str) -> Path:
+        return self.cache_dir / self._safe_name(revision)
+
+    def prune_stale(self, revision: str):
+        """Deletes cache entries written for any revision other than the current one."""
+        if revision in self._pruned_revisions or not self.cache_dir.exists():
+            return
+        self._pruned_revisions.add(revision)
+
+        current = self._revision_dir(revision)
+        for revision_dir in self.cache_dir.iterdir():
+            if revision_dir.is_dir() and revision_dir != current:
+                for file in [*revision_dir.glob("*.wcc"), *revision_dir.glob("*.wcg"), *revision_dir.glob("*.tmp")]:
+                    file.unlink(missing_ok=True)
+                try:
+                    revision_dir.rmdir()
+                    logger.debug(f"Removed stale collision cache {revision_dir.name}.")
+                except OSError:
+                    pass
+
+    def _zone_files(self, revision: str, zone_name: str, suffix_pattern: str) -> list[Path]:
+        # Matched exactly, as a prefix glob for WizardCity/WC_Hub would also catch WizardCity/WC_Hub/Interior
+        pattern = re.compile(rf"{re.escape(self._safe_name(zone_name))}-[0-9a-f]{{32}}{suffix_pattern}")
+        revision_dir = self._revision_dir(revision)
+        if not revision_dir.is_dir():
+            return []
+        return [file for file in revision_dir.iterdir() if pattern.fullmatch(file.name)]
+
+    def find(self, revision: str, zone_name: str, content_hash: str = None) -> Optional[Path]:
+        """The compiled file for this bcd hash, or the newest one for the zone when the hash is not known."""
+        if content_hash is not None:
+            path = self._revision_dir(revision) / f"{self._safe_name(zone_name)}-{content_hash}.wcc"
+            return path if path.exists() else None
+        candidates = self._zone_files(revision, zone_name, r"\.wcc")
+        if not candidates:
+            return None
+        return max(candidates, key=lambda file: file.stat().st_mtime)
+
+    def save(self, revision: str, zone_name: str, raw_data: bytes, world: ColumnarWorld | CollisionWorld) -> Path:
+        self.prune_stale(revision)
+        revision_dir = self._revision_dir(revision)
+        revision_dir.mkdir(parents=True, exist_ok=True)
+
+        content_hash = self.content_hash(raw_data)
+        path = revision_dir / f"{self._safe_name(zone_name)}-{content_hash}.wcc"
+
+        header = {"revision": revision, "zone": zone_name, "bcd_hash": content_hash, **_world_filter_header(world)}
+        self._write_arrays(path, header, dict(_columnar(world).arrays))
+
+        # Older builds of the same zone under this revision are superseded, along with their grids
+        for old_file in self._zone_files(revision, zone_name, r"(\.[0-9a-f]+\.wcg|\.wcc)"):
+            if old_file != path and not old_file.name.startswith(f"{path.stem}."):
+                try:
+                    old_file.unlink()
+                except OSError:
+                    pass
+
+        return path
+
+    def _write_arrays(self, path: Path, header: dict, arrays: dict[str, np.ndarray]):
+        layout = {}
+        offset = 0
+        for name, array in arrays.items():
+            offset = -(-offset // self.ALIGNMENT) * self.ALIGNMENT
+            layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+            offset += array.nbytes
+
+        header = json.dumps({**header, "arrays": layout}).encode()
+        # Array offsets are relative to the aligned start of the data section
+        data_start = -(-(len(self.MAGIC) + 4 + len(header)) // self.ALIGNMENT) * self.ALIGNMENT
+
+        # Geometry workers are separate processes, so each writes its own temporary file
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with tmp_path.open("wb") as file:
+            file.write(self.MAGIC)
+            file.write(struct.pack("<I", len(header)))
+            file.write(header)
+            for name, array in arrays.items():
+                file.seek(data_start + layout[name]["offset"])
+                file.write(np.ascontiguousarray(array).tobytes())
+        os.replace(tmp_path, path)
+
+    def _grid_path(self, revision: str, zone_name: str, grid_tag: str) -> Optional[Path]:
+        # Grids sit next to the compiled zone they were built from, so a new bcd invalidates them
+        world_path = self.find(revision, zone_name)
+        if world_path is None:
+            return None
+        return world_path.with_name(f"{world_path.stem}.{grid_tag}.wcg")
+
+    def save_grid(self, revision: str, zone_name: str, grid_tag: str, grid: "OccupancyGrid") -> Optional[Path]:
+        path = self._grid_path(revision, zone_name, grid_tag)
+        if path is not None:
+            self._write_arrays(path, {"revision": revision, "zone": zone_name, **grid.header()}, grid.arrays())
+        return path
+
+    def load_grid(self, revision: str, zone_name: str, grid_tag: str) -> Optional["OccupancyGrid"]:
+        path = self._grid_path(revision, zone_name, grid_tag)
+        if path is None or not path.exists():
+            return None
+
+        try:
+            header, arrays = self.load_arrays(path)
+            return OccupancyGrid.from_arrays(header, arrays)
+        except Exception as e:
+            logger.error(f"Discarding unreadable occupancy grid {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def load_arrays(self, path: Path) -> tuple[dict, dict[str, np.ndarray]]:
+        with path.open("rb") as file:
+            if file.read(len(self.MAGIC)) != self.MAGIC:
+                raise ValueError(f"{path.name} is not a compiled collision file")
+            header_length, = struct.unpack("<I", file.read(4))
+            header = json.loads(file.read(header_length))
+
+        data_start = -(-(len(self.MAGIC) + 4 + header_length) // self.ALIGNMENT) * self.ALIGNMENT
+        mapped = np.memmap(path, dtype=np.uint8, mode="r")
+        arrays = {}
+        for name, info in header["arrays"].items():
+            dtype = np.dtype(info["dtype"])
+            shape = tuple(info["shape"])
+            start = data_start + info["offset"]
+            nbytes = dtype.itemsize * math.prod(shape)
+            arrays[name] = mapped[start:start + nbytes].view(dtype).reshape(shape)
+        return header, arrays
+
+    def load(
+            self,
+            revision: str,
+            zone_name: str,
+            categories: CollisionFlag = None,
+            normals: bool = True,
+            faces: bool = True,
+            content_hash: str = None
+    ) -> Optional[ColumnarWorld]:
+        self.prune_stale(revision)
+        path = self.find(revision, zone_name, content_hash)
+        if path is None:
+            return None
+
+        try:
+            header, arrays = self.load_arrays(path)
+            if header["revision"] != revision or header["zone"] != zone_name:
+                # A valid file for a zone whose name sanitizes the same way; leave it to that zone
+                logger.debug(f"{path.name} was written for {header['revision']}/{header['zone']}, recompiling.")
+                return None
+            # Files written before filtering existed hold every object, normals included
+            unfiltered = _world_filter_header(CollisionWorld())
+            wanted = _world_filter_header(CollisionWorld(categories=categories, normals=normals, faces=faces))
+            if any(header.get(name, unfiltered[name]) != value for name, value in wanted.items()):
+                logger.debug(f"{path.name} was compiled with other parse filters, recompiling.")
+                return None
+            # The columns stay views into the memory-mapped file
+            return ColumnarWorld(arrays, categories, normals, faces)
+        except Exception as e:
+            logger.error(f"Discarding unreadable collision cache {path.name}: {e}")
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            return None
+
+
+collision_disk_cache = CollisionDiskCache(collision_config["cache_dir"]) if collision_config["disk_cache"] else None
+
+
+def _geometry_nbytes(shapes) -> int:
+    """Rough size of shapely geometries: 16 bytes per 2D coordinate plus per-object overhead."""
+    if shapes is None:
+        return 0
+    shapes = np.asarray(shapes, dtype=object).ravel()
+    return int(shapely.get_num_coordinates(shapes).sum()) * 16 + len(shapes) * 200
+
+
+def _tile_grid(bounds: tuple, tiles: int) -> list[Polygon]:
+    """Splits the bounds into a tiles x tiles grid of boxes, padded at the outer edges."""
+    minx, miny, maxx, maxy = bounds
+    xs = np.linspace(minx, maxx, tiles + 1)
+    ys = np.linspace(miny, maxy, tiles + 1)
+    xs[0], ys[0], xs[-1], ys[-1] = minx - 1, miny - 1, maxx + 1, maxy + 1
+    return [box(xs[i], ys[j], xs[i + 1], ys[j + 1]) for i in range(tiles) for j in range(tiles)]
+
+
+def _clip_to_tile(shapes: np.ndarray, tree: STRtree, tile: Polygon) -> np.ndarray:
+    """Polygon pieces of the shapes inside the tile. Shapes wholly inside the tile are not clipped."""
+    candidates = shapes[tree.query(tile, predicate="intersects")]
+    inside = shapely.contains_properly(tile, candidates)
+    clipped = shapely.get_parts(shapely.intersection(candidates[~inside], tile))
+    clipped = clipped[shapely.get_type_id(clipped) == 3]
+    return np.concatenate([candidates[inside], clipped])
+
+
+def _union_tile(coll_slice: "CollisionSlice", tile: Polygon) -> tuple:
+    """Collision union, walkable union and free area of one tile."""
+    shapely.prepare(tile)
+    coll_pieces = _clip_to_tile(coll_slice.coll_shapes, coll_slice.coll_tree, tile)
+    mesh_pieces = _clip_to_tile(coll_slice.mesh_shapes, coll_slice.mesh_tree, tile)
+    union_coll = unary_union(coll_pieces) if len(coll_pieces) else Polygon()
+    union_mesh = unary_union(mesh_pieces) if len(mesh_pieces) else Polygon()
+    return union_coll, union_mesh, union_mesh.difference(union_coll)
+
+
+def _stitch_tiles(pieces) -> Polygon | MultiPolygon:
+    """Joins per-tile results. Tiles only share edges, so a coverage union is enough."""
+    parts = shapely.get_parts(np.array(pieces, dtype=object))
+    parts = parts[shapely.get_type_id(parts) == 3]
+    return shapely.coverage_union_all(parts) if len(parts) else Polygon()
+
+
+_union_pools: dict[int, ThreadPoolExecutor] = {}
 
-    coll_shapes = build_collision_shapes(world, z_slice)
-    mesh_shapes = build_mesh_shapes(world, z_slice)
-    return world, coll_shapes, mesh_shapes
 
+def _get_union_pool(workers: int) -> ThreadPoolExecutor:
+    # GEOS releases the GIL, so threads are enough to spread the tiles over cores
+    pool = _union_pools.get(workers)
+    if pool is None:
+        pool = _union_pools[workers] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="collision-union")
+    return pool
 
-async def _get_entity_collision_shapes(client: Client, static_body_radius: float) -> List[Polygon]:
+
+def build_slice_unions(coll_slice: "CollisionSlice", tiles: int = None, workers: int = None) -> tuple:
     """
-    Gets entities and approximates their collision shapes as circles.
-    Uses a dynamic radius for 'CharacterBody' and a static default radius for other types.
+    Builds (collision union, walkable union, free area) of a slice. With more than one tile per side the
+    bounds are split into a grid, every tile is clipped and unioned in parallel and the tiles are stitched.
     """
-    #logger.debug("Getting dynamic entity collision shapes...")
-    entity_shapes = []
-    try:
-        entity_list = await client.get_base_entity_list()
-        for entity in entity_list:
-            entity_name = await entity.object_name()
-            if entity_name == "Player Object":
-                continue
+    tiles = collision_config["union_tiles"] if tiles is None else tiles
+    workers = collision_config["union_workers"] if workers is None else workers
+    workers = workers or os.cpu_count() or 1
+    bounds = coll_slice.all_bounds
+
+    # Clipping costs extra work, which only pays off when the tiles run on several cores
+    if tiles <= 1 or workers <= 1 or bounds is None:
+        union_coll = unary_union(coll_slice.coll_shapes) if len(coll_slice.coll_shapes) else Polygon()
+        union_mesh = unary_union(coll_slice.mesh_shapes) if len(coll_slice.mesh_shapes) else Polygon()
+        return union_coll, union_mesh, union_mesh.difference(union_coll)
+
+    grid = _tile_grid(bounds, tiles)
+    workers = min(workers, len(grid))
+    results = list(_get_union_pool(workers).map(lambda tile: _union_tile(coll_slice, tile), grid))
+    return tuple(_stitch_tiles(pieces) for pieces in zip(*results))
+
+
+def benchmark_union(coll_slice: "CollisionSlice", tile_counts: tuple = (1, 2, 4, 8), workers: int = None, repeat: int = 3) -> dict[int, float]:
+    """
+    Times build_slice_unions for each tile count (1 is the monolithic union) and returns the best
+    time in seconds per tile count. Results are logged as well.
+    """
+    timings = {}
+    for tiles in tile_counts:
+        best = math.inf
+        for _ in range(repeat):
+            start = time.perf_counter()
+            build_slice_unions(coll_slice, tiles, workers)
+            best = min(best, time.perf_counter() - start)
+        timings[tiles] = best
+        logger.info(f"Union with {tiles}x{tiles} tiles: {best * 1000:.0f} ms")
+    return timings
+
+
+class CollisionSlice:
+    """
+    The 2D collision layer of a zone at one height, with STRtree indexes over the static
+    collision shapes and walkable mesh shapes so teleports only touch geometry near the target.
+
+    The whole-slice unions are prepared for repeated predicates and, with a tolerance, simplified with
+    topology preserved. A simplified boundary moves by at most the tolerance, so anything eroding the
+    free area erodes it by the player radius plus the tolerance to stay clear of the real boundary.
+    """
+    def __init__(self, coll_shapes: List[Polygon], mesh_shapes: List[Polygon], tolerance: float = 0.0):
+        self.coll_shapes = np.array(coll_shapes, dtype=object)
+        self.mesh_shapes = np.array(mesh_shapes, dtype=object)
+        self.coll_tree = STRtree(self.coll_shapes)
+        self.mesh_tree = STRtree(self.mesh_shapes)
+        self._union_coll = None
+        self._union_mesh = None
+        self._free_area = None
+        self.tolerance = tolerance
+        self.vertex_counts: dict[str, tuple[int, int]] = {}
+        self.occupancy: Optional["OccupancyGrid"] = None
+
+    @property
+    def bounds(self) -> Optional[tuple]:
+        """Bounds of the walkable area, or of the collision shapes when the zone has no mesh."""
+        for shapes in (self.mesh_shapes, self.coll_shapes):
+            if len(shapes):
+                return tuple(shapely.total_bounds(shapes).tolist())
+        return None
+
+    @property
+    def all_bounds(self) -> Optional[tuple]:
+        """Bounds of every static shape in the slice."""
+        shapes = np.concatenate([self.coll_shapes, self.mesh_shapes])
+        return tuple(shapely.total_bounds(shapes).tolist()) if len(shapes) else None
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            _geometry_nbytes(self.coll_shapes) + _geometry_nbytes(self.mesh_shapes)
+            + _geometry_nbytes(self._union_coll) + _geometry_nbytes(self._union_mesh)
+            + _geometry_nbytes(self._free_area)
+            + (self.occupancy.nbytes if self.occupancy is not None else 0)
+        )
+
+    def intersects(self, geometry) -> bool:
+        """True if the geometry touches any static collision shape."""
+        return len(self.coll_tree.query(geometry, predicate="intersects")) > 0
+
+    def coll_shapes_near(self, geometry) -> np.ndarray:
+        return self.coll_shapes[self.coll_tree.query(geometry, predicate="intersects")]
+
+    def segments_clear(self, segments: np.ndarray, radius: float) -> np.ndarray:
+        """For each (n, 2, 2) segment, True if a circle of radius can sweep along it without touching static collision."""
+        segments = np.asarray(segments, dtype=np.float64).reshape(-1, 2, 2)
+        clear = np.ones(len(segments), dtype=bool)
+        if len(segments) and len(self.coll_shapes):
+            hit = self.coll_tree.query(shapely.linestrings(segments), predicate="dwithin", distance=radius)[0]
+            clear[hit] = False
+        return clear
+
+    def mesh_shapes_near(self, geometry) -> np.ndarray:
+        return self.mesh_shapes[self.mesh_tree.query(geometry, predicate="intersects")]
+
+    def _build_unions(self):
+        unions = build_slice_unions(self)
+        if self.tolerance > 0:
+            simplified = shapely.simplify(np.array(unions, dtype=object), self.tolerance, preserve_topology=True)
+        else:
+            simplified = np.array(unions, dtype=object)
+        shapely.prepare(simplified)
+
+        before = shapely.get_num_coordinates(np.array(unions, dtype=object))
+        after = shapely.get_num_coordinates(simplified)
+        self.vertex_counts = {
+            name: (int(b), int(a)) for name, b, a in zip(("union_coll", "union_mesh", "free_area"), before, after)
+        }
+        self._union_coll, self._union_mesh, self._free_area = simplified
+
+    @property
+    def union_coll(self):
+        if self._union_coll is None:
+            self._build_unions()
+        return self._union_coll
+
+    @property
+    def union_mesh(self):
+        if self._union_mesh is None:
+            self._build_unions()
+        return self._union_mesh
 
-            actor_body = await entity.actor_body()
-            if not actor_body:
+    @property
+    def free_area(self):
+        """Walkable area minus static collision over the whole slice."""
+        if self._free_area is None:
+            self._build_unions()
+        return self._free_area
+
+
+def _lower_envelope_rows(f: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    1D squared distance transform of every row of f at once (Felzenszwalb & Huttenlocher): for each q,
+    min over p of (q - p)^2 + f[p], and the p reaching it. The lower envelope of parabolas is built for
+    all rows in lockstep; inf entries of f add no parabola.
+    """
+    n_rows, width = f.shape
+    rows = np.arange(n_rows)
+    vertices = np.zeros((n_rows, width), dtype=np.int64)
+    bounds = np.full((n_rows, width + 1), np.inf)
+    last = np.full(n_rows, -1, dtype=np.int64)
+
+    for q in range(width):
+        fq = f[:, q]
+        active = np.isfinite(fq)
+        pending = rows[active & (last >= 0)]
+        first = rows[active & (last < 0)]
+        last[first] = 0
+        vertices[first, 0] = q
+        bounds[first, 0] = -np.inf
+
+        while len(pending):
+            k = last[pending]
+            v = vertices[pending, k]
+            crossing = ((fq[pending] + q * q) - (f[pending, v] + v * v)) / (2 * (q - v))
+            hidden = crossing <= bounds[pending, k]
+
+            push = pending[~hidden]
+            k = last[push] + 1
+            last[push] = k
+            vertices[push, k] = q
+            bounds[push, k] = crossing[~hidden]
+            bounds[push, k + 1] = np.inf
+
+            # Parabolas hidden by the new one are popped and the new one is retried against the previous
+            last[pending[hidden]] -= 1
+            pending = pending[hidden]
+
+    distance = np.full((n_rows, width), np.inf)
+    nearest = np.full((n_rows, width), -1, dtype=np.int64)
+    rows = rows[last >= 0]
+    k = np.zeros(n_rows, dtype=np.int64)
+    for q in range(width):
+        advance = rows[bounds[rows, k[rows] + 1] < q]
+        while len(advance):
+            k[advance] += 1
+            advance = advance[bounds[advance, k[advance] + 1] < q]
+        v = vertices[rows, k[rows]]
+        distance[rows, q] = (q - v) ** 2 + f[rows, v]
+        nearest[rows, q] = v
+    return distance, nearest
+
+
+def distance_transform(features: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Exact Euclidean distance transform in pure numpy. Returns the distance (in cells) from every cell to
+    the nearest True cell of the 2D mask, and the flat index of that cell (inf and -1 when there is none).
+    """
+    height, width = features.shape
+    ys = np.arange(height)[:, None]
+
+    # Column pass: nearest feature above and below every cell
+    above = np.maximum.accumulate(np.where(features, ys, -1), axis=0)
+    below = np.minimum.accumulate(np.where(features, ys, height)[::-1], axis=0)[::-1]
+    dist_above = np.where(above >= 0, ys - above, np.inf)
+    dist_below = np.where(below < height, below - ys, np.inf)
+    nearest_row = np.where(dist_above <= dist_below, above, below)
+
+    # Row pass over the squared column distances
+    squared, nearest_col = _lower_envelope_rows(np.minimum(dist_above, dist_below) ** 2)
+
+    found = nearest_col >= 0
+    nearest = np.full((height, width), -1, dtype=np.int64)
+    row_index = np.broadcast_to(ys, (height, width))[found]
+    nearest[found] = nearest_row[row_index, nearest_col[found]] * width + nearest_col[found]
+    return np.sqrt(squared), nearest
+
+
+class OccupancyGrid:
+    """
+    The free area of a slice (walkable and not static collision) sampled at cell centers, with the distance
+    from every cell to the nearest blocked cell precomputed. Safe points become array lookups: for each
+    player radius a nearest-safe-cell index maps any cell to the closest cell the player fits in.
+
+    Clearance is conservative: a cell is safe for radius r only if the nearest blocked cell center is at
+    least r plus half a cell diagonal away, so the true collision boundary is at least r away.
+    """
+    MAX_CELLS = 1 << 22
+
+    def __init__(
+            self,
+            origin: tuple[float, float],
+            cell_size: float,
+            free: np.ndarray,
+            distance: np.ndarray = None,
+            tolerance: float = 0.0
+    ):
+        self.origin = origin
+        self.cell_size = cell_size
+        self.tolerance = tolerance  # simplify tolerance of the free area the grid was sampled from
+        self.free = free
+        if distance is None:
+            distance = distance_transform(~free)[0].astype(np.float32)
+        self.distance = distance
+        self._nearest_safe: dict[int, np.ndarray] = {}
+        self._nav_graphs: dict[tuple[int, int], NavGraph] = {}
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.free.shape
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.free.nbytes + self.distance.nbytes
+            + sum(index.nbytes for index in self._nearest_safe.values())
+            + sum(graph.nbytes for graph in self._nav_graphs.values())
+        )
+
+    @classmethod
+    def from_slice(cls, coll_slice: CollisionSlice, cell_size: float) -> Optional["OccupancyGrid"]:
+        bounds = coll_slice.bounds
+        if bounds is None:
+            return None
+
+        minx, miny, maxx, maxy = bounds
+        cell_size = max(cell_size, math.sqrt((maxx - minx) * (maxy - miny) / cls.MAX_CELLS))
+        # One blocked cell of padding on each side keeps the zone edge an obstacle
+        origin = (minx - cell_size, miny - cell_size)
+        width = math.ceil((maxx - minx) / cell_size) + 2
+        height = math.ceil((maxy - miny) / cell_size) + 2
+
+        xs = origin[0] + (np.arange(width) + 0.5) * cell_size
+        ys = origin[1] + (np.arange(height) + 0.5) * cell_size
+        free_area = coll_slice.free_area
+        shapely.prepare(free_area)
+        free = shapely.contains_xy(free_area, *np.meshgrid(xs, ys))
+        return cls(origin, cell_size, free, tolerance=coll_slice.tolerance)
+
+    def header(self) -> dict:
+        return {"origin": list(self.origin), "cell_size": self.cell_size, "tolerance": self.tolerance}
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        return {"free": self.free, "distance": self.distance}
+
+    @classmethod
+    def from_arrays(cls, header: dict, arrays: dict[str, np.ndarray]) -> "OccupancyGrid":
+        return cls(tuple(header["origin"]), header["cell_size"], arrays["free"], arrays["distance"], header.get("tolerance", 0.0))
+
+    def _safe_level(self, player_radius: float) -> int:
+        # Radii are rounded up to half-cell steps so one index serves a small range of players
+        return max(math.ceil(2 * (player_radius + self.tolerance) / self.cell_size), 0)
+
+    def _safe_mask(self, level: int) -> np.ndarray:
+        return self.distance >= level / 2 + math.sqrt(0.5)
+
+    def safe_cells(self, player_radius: float) -> np.ndarray:
+        """Mask of the cells a player of this radius fits in."""
+        return self._safe_mask(self._safe_level(player_radius))
+
+    def nav_graph(self, player_radius: float, node_size: float) -> "NavGraph":
+        """The navigation graph for this radius step, built on first use."""
+        step = max(round(node_size / self.cell_size), 1)
+        key = (self._safe_level(player_radius), step)
+        graph = self._nav_graphs.get(key)
+        if graph is None:
+            graph = self._nav_graphs[key] = NavGraph(self, player_radius, step)
+        return graph
+
+    def nearest_safe(self, player_radius: float) -> np.ndarray:
+        """Flat index of the nearest safe cell for every cell (-1 if none), built once per radius step."""
+        level = self._safe_level(player_radius)
+        nearest = self._nearest_safe.get(level)
+        if nearest is None:
+            nearest = self._nearest_safe[level] = distance_transform(self._safe_mask(level))[1].astype(np.int32)
+        return nearest
+
+    def cell_of(self, x: float, y: float) -> tuple[int, int]:
+        height, width = self.shape
+        col = min(max(int((x - self.origin[0]) // self.cell_size), 0), width - 1)
+        row = min(max(int((y - self.origin[1]) // self.cell_size), 0), height - 1)
+        return row, col
+
+    def cell_center(self, index: int) -> tuple[float, float]:
+        row, col = divmod(int(index), self.shape[1])
+        return self.origin[0] + (col + 0.5) * self.cell_size, self.origin[1] + (row + 0.5) * self.cell_size
+
+    def _entity_clearance(self, player_radius: float, entities: "EntityLayer") -> np.ndarray:
+        return entities.radii + player_radius + self.cell_size * math.sqrt(0.5)
+
+    def find_safe_point(self, target: XYZ, player_radius: float, entities: "EntityLayer") -> Optional[tuple[float, float]]:
+        """Nearest safe cell center to the target, to within a cell, also keeping clear of entity circles."""
+        index = self.nearest_safe(player_radius)[self.cell_of(target.x, target.y)]
+        if index < 0:
+            return None
+
+        point = self.cell_center(index)
+        if not len(entities):
+            return point
+        gaps = np.hypot(entities.positions[:, 0] - point[0], entities.positions[:, 1] - point[1])
+        if np.all(gaps >= self._entity_clearance(player_radius, entities)):
+            return point
+
+        # An entity stands on the precomputed answer, so scan the safe cells with entity circles cut out
+        return self._scan_safe_point(target, player_radius, entities)
+
+    def _scan_safe_point(self, target: XYZ, player_radius: float, entities: "EntityLayer") -> Optional[tuple[float, float]]:
+        safe = self._safe_mask(self._safe_level(player_radius))
+        height, width = self.shape
+        for (ex, ey), reach in zip(entities.positions, self._entity_clearance(player_radius, entities)):
+            (row_lo, col_lo), (row_hi, col_hi) = self.cell_of(ex - reach, ey - reach), self.cell_of(ex + reach, ey + reach)
+            xs = self.origin[0] + (np.arange(col_lo, col_hi + 1) + 0.5) * self.cell_size
+            ys = self.origin[1] + (np.arange(row_lo, row_hi + 1) + 0.5) * self.cell_size
+            inside = np.hypot(xs[None, :] - ex, ys[:, None] - ey) < reach
+            safe[row_lo:row_hi + 1, col_lo:col_hi + 1] &= ~inside
+
+        candidates = np.flatnonzero(safe)
+        if not len(candidates):
+            return None
+        rows, cols = np.divmod(candidates, width)
+        xs = self.origin[0] + (cols + 0.5) * self.cell_size
+        ys = self.origin[1] + (rows + 0.5) * self.cell_size
+        best = np.argmin((xs - target.x) ** 2 + (ys - target.y) ** 2)
+        return float(xs[best]), float(ys[best])
+
+
+class NavGraph:
+    """
+    Coarse 8-connected grid graph over an occupancy grid for one player radius step. Each node is a block
+    of step x step cells, passable when the player fits at its center cell, and an edge exists when the
+    player fits along the whole straight line between two node centers. Edges, connected components and
+    the nearest passable node of every node are precomputed, so unreachable targets fail at once and A*
+    only runs between nodes known to be connected.
+    """
+    NEIGHBOURS = ((-1, 0, 1.0), (1, 0, 1.0), (0, -1, 1.0), (0, 1, 1.0),
+                  (-1, -1, math.sqrt(2)), (-1, 1, math.sqrt(2)), (1, -1, math.sqrt(2)), (1, 1, math.sqrt(2)))
+    SMOOTH_BATCH = 4
+
+    def __init__(self, grid: OccupancyGrid, player_radius: float, step: int):
+        self.grid = grid
+        self.step = step
+        self.safe = grid.safe_cells(player_radius)
+
+        height, width = grid.shape
+        self.rows = np.arange(step // 2, height, step)
+        self.cols = np.arange(step // 2, width, step)
+        self.passable = self.safe[np.ix_(self.rows, self.cols)]
+        self.edges = self._build_edges()
+        self.adjacency = self._build_adjacency()
+        self.labels = self._label_components()
+        self.nearest_passable = distance_transform(self.passable)[1].astype(np.int32)
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.safe.nbytes + self.passable.nbytes + self.edges.nbytes
+            + self.labels.nbytes + self.nearest_passable.nbytes
+            + sum(len(neighbours) for neighbours in self.adjacency) * 16
+        )
+
+    def _build_edges(self) -> np.ndarray:
+        """edges[k, row, col] is True if the player can move from the node to its k-th neighbour."""
+        height, width = self.grid.shape
+        center_rows, center_cols = np.meshgrid(self.rows, self.cols, indexing="ij")
+        edges = np.zeros((len(self.NEIGHBOURS), *self.passable.shape), dtype=bool)
+        for k, (d_row, d_col, _) in enumerate(self.NEIGHBOURS):
+            end_rows, end_cols = center_rows + d_row * self.step, center_cols + d_col * self.step
+            clear = self.passable & (end_rows >= 0) & (end_rows < height) & (end_cols >= 0) & (end_cols < width)
+            # Walk every cell the line crosses, checking all node pairs at once. Neighbours are straight or
+            # at 45 degrees, so the line crosses exactly the cells one step apart along it; rounding sampled
+            # points instead (np.rint rounds halves to even) zig-zags diagonals into the cells beside the line
+            for offset in range(1, self.step + 1):
+                sample_rows = np.clip(center_rows + d_row * offset, 0, height - 1)
+                sample_cols = np.clip(center_cols + d_col * offset, 0, width - 1)
+                clear &= self.safe[sample_rows, sample_cols]
+            edges[k] = clear
+        return edges
+
+    def _build_adjacency(self) -> list[list[tuple[int, float]]]:
+        """(neighbour, cost) lists per node, so A* does no numpy indexing in its inner loop."""
+        width = self.passable.shape[1]
+        sources, targets, costs = [], [], []
+        for k, (d_row, d_col, cost) in enumerate(self.NEIGHBOURS):
+            source = np.flatnonzero(self.edges[k])
+            sources.append(source)
+            targets.append(source + d_row * width + d_col)
+            costs.append(np.full(len(source), cost))
+        sources, targets, costs = np.concatenate(sources), np.concatenate(targets), np.concatenate(costs)
+
+        order = np.argsort(sources, kind="stable")
+        starts = np.searchsorted(sources[order], np.arange(self.passable.size + 1)).tolist()
+        targets, costs = targets[order].tolist(), costs[order].tolist()
+        return [list(zip(targets[lo:hi], costs[lo:hi])) for lo, hi in zip(starts, starts[1:])]
+
+    def _label_components(self) -> np.ndarray:
+        labels = np.full(self.passable.size, -1, dtype=np.int32)
+        label = 0
+        for seed in np.flatnonzero(self.passable):
+            if labels[seed] >= 0:
+                continue
+            labels[seed] = label
+            queue = deque([int(seed)])
+            while queue:
+                for neighbour, _ in self.adjacency[queue.popleft()]:
+                    if labels[neighbour] < 0:
+                        labels[neighbour] = label
+                        queue.append(neighbour)
+            label += 1
+        return labels.reshape(self.passable.shape)
+
+    def node_of(self, x: float, y: float) -> int:
+        """Flat index of the nearest passable node to a point, or -1 if there is none."""
+        row, col = self.grid.cell_of(x, y)
+        node = (min(row // self.step, len(self.rows) - 1), min(col // self.step, len(self.cols) - 1))
+        return int(self.nearest_passable[node])
+
+    def node_center(self, node: int) -> tuple[float, float]:
+        row, col = divmod(node, len(self.cols))
+        return self.grid.cell_center(self.rows[row] * self.grid.shape[1] + self.cols[col])
+
+    def lines_fit(self, a: tuple[float, float], ends: np.ndarray) -> np.ndarray:
+        """For each end point, True if every cell on the line from a fits the player, sampled every half cell."""
+        ends = np.asarray(ends, dtype=np.float64).reshape(-1, 2)
+        samples = max(math.ceil(np.hypot(*(ends - a).T).max(initial=0) / (self.grid.cell_size * 0.5)), 1) + 1
+        t = np.linspace(0, 1, samples)
+        xs = a[0] + (ends[:, 0, None] - a[0]) * t
+        ys = a[1] + (ends[:, 1, None] - a[1]) * t
+        height, width = self.grid.shape
+        cols = np.clip(((xs - self.grid.origin[0]) // self.grid.cell_size).astype(np.int64), 0, width - 1)
+        rows = np.clip(((ys - self.grid.origin[1]) // self.grid.cell_size).astype(np.int64), 0, height - 1)
+        return self.safe[rows, cols].all(axis=1)
+
+    def _a_star(self, start: int, goal: int) -> Optional[list[int]]:
+        width = self.passable.shape[1]
+        goal_row, goal_col = divmod(goal, width)
+        diagonal = math.sqrt(2) - 1
+        adjacency = self.adjacency
+
+        costs = {start: 0.0}
+        came_from = {start: -1}
+        open_heap = [(0.0, 0.0, start)]
+        while open_heap:
+            _, cost, node = heapq.heappop(open_heap)
+            if node == goal:
+                path = [node]
+                while came_from[path[-1]] >= 0:
+                    path.append(came_from[path[-1]])
+                return path[::-1]
+            if cost > costs[node]:
                 continue
 
-            actor_type = await actor_body.read_type_name()
-            entity_loc = await actor_body.position()
-            entity_radius = 0.0
+            for neighbour, step_cost in adjacency[node]:
+                new_cost = cost + step_cost
+                if new_cost < costs.get(neighbour, math.inf):
+                    costs[neighbour] = new_cost
+                    came_from[neighbour] = node
+                    # Octile distance, exact on an obstacle-free 8-connected grid
+                    row, col = divmod(neighbour, width)
+                    d_row, d_col = abs(row - goal_row), abs(col - goal_col)
+                    estimate = max(d_row, d_col) + diagonal * min(d_row, d_col)
+                    heapq.heappush(open_heap, (new_cost + estimate, new_cost, neighbour))
+        return None
+
+    def find_path(
+            self,
+            start: tuple[float, float],
+            goal: tuple[float, float],
+            lines_clear: Callable[[tuple[float, float], np.ndarray], np.ndarray] = None
+    ) -> Optional[list[tuple[float, float]]]:
+        """
+        Waypoints from start to goal (start excluded, goal included), or None if they are not connected.
+        The node path from A* is shortened by jumping ahead while the next node is still in clear line,
+        testing the jumps in growing batches: by lines_fit on the grid, then by lines_clear if given.
+        """
+        start_node, goal_node = self.node_of(*start), self.node_of(*goal)
+        if start_node < 0 or goal_node < 0 or self.labels.flat[start_node] != self.labels.flat[goal_node]:
+            return None
+
+        nodes = self._a_star(start_node, goal_node)
+        if nodes is None:
+            return None
+        points = np.array([self.node_center(node) for node in nodes])
+
+        waypoints = []
+        index = 0
+        while index < len(points) - 1:
+            furthest = index + 1
+            batch = self.SMOOTH_BATCH
+            while furthest + 1 < len(points):
+                chunk = points[furthest + 1:furthest + 1 + batch]
+                clear = self.lines_fit(points[index], chunk)
+                prefix = len(chunk) if clear.all() else int(clear.argmin())
+                if lines_clear is not None and prefix:
+                    clear = lines_clear(points[index], chunk[:prefix])
+                    prefix = prefix if clear.all() else int(clear.argmin())
+                furthest += prefix
+                if prefix < len(chunk):
+                    break
+                batch *= 2
+            waypoints.append(tuple(points[furthest].tolist()))
+            index = furthest
+
+        # The goal itself is off the node grid; the last hop goes straight to it
+        if not waypoints or waypoints[-1] != tuple(goal):
+            waypoints.append(tuple(goal))
+        return waypoints
+
+
+def _split_hops(waypoints: list[tuple[float, float]], start: tuple[float, float], hop_distance: float) -> list[tuple[float, float]]:
+    """Inserts intermediate points so no hop along the path is longer than hop_distance."""
+    hops = []
+    previous = start
+    for point in waypoints:
+        count = max(math.ceil(math.dist(previous, point) / hop_distance), 1)
+        for i in range(1, count + 1):
+            t = i / count
+            hops.append((previous[0] + (point[0] - previous[0]) * t, previous[1] + (point[1] - previous[1]) * t))
+        previous = point
+    return hops
+
+
+class ZoneCollision:
+    """
+    A zone's collision in columnar form (ColumnarWorld) plus the 2D slices built from it, as kept in collision_cache.
+    Slices are memoized per z bucket of z_bucket_size units (or per exact height when it is 0).
+    """
+    MAX_SLICES = 16
+
+    def __init__(self, world: ColumnarWorld, key: tuple[str, str] = None):
+        self.world = world
+        self.key = key
+        self.slices: OrderedDict[float, CollisionSlice] = OrderedDict()
+        self._world_nbytes = world.nbytes
+        self._primitives = None
+        self._walkable = None
+        self._floor = None
+        self.entities = EntityLayer()
+        # Held while slices, grids and the floor are built, which happens on worker threads
+        self.build_lock = threading.Lock()
+
+    @property
+    def primitives(self) -> "CollisionPrimitives":
+        if self._primitives is None:
+            self._primitives = CollisionPrimitives(self.world)
+        return self._primitives
+
+    @property
+    def walkable(self) -> "WalkableTriangles":
+        if self._walkable is None:
+            self._walkable = WalkableTriangles(self.world)
+        return self._walkable
+
+    @property
+    def floor(self) -> "FloorBVH":
+        if self._floor is None:
+            self._floor = FloorBVH(self.walkable.triangles)
+        return self._floor
+
+    def snap_z(self, x: float, y: float, z0: float) -> float:
+        return self.floor.snap_z(x, y, z0, collision_config["floor_step_up"])
+
+    @property
+    def nbytes(self) -> int:
+        size = self._world_nbytes + sum(coll_slice.nbytes for coll_slice in self.slices.values()) + self.entities.nbytes
+        if self._primitives is not None:
+            size += self._primitives.nbytes
+        if self._walkable is not None:
+            size += self._walkable.nbytes
+        if self._floor is not None:
+            size += self._floor.nbytes
+        return size
+
+    @staticmethod
+    def slice_key(z_slice: float) -> float | int:
+        bucket_size = collision_config["z_bucket_size"]
+        if bucket_size <= 0:
+            return z_slice
+        return math.floor(z_slice / bucket_size)
+
+    def slice_at(self, z_slice: float, player_radius: float = 0.0) -> CollisionSlice:
+        """
+        The memoized slice at this height. A new slice simplifies its unions by simplify_tolerance times
+        player_radius; the slice is shared by every radius, so smaller players just keep a little more
+        clearance than they need.
+        """
+        key = self.slice_key(z_slice)
+        coll_slice = self.slices.get(key)
+        if coll_slice is not None:
+            self.slices.move_to_end(key)
+            return coll_slice
+
+        # A bucket keeps every primitive reaching any height inside it, so one slice serves the whole floor
+        if isinstance(key, int):
+            bucket_size = collision_config["z_bucket_size"]
+            z_lo, z_hi = key * bucket_size, (key + 1) * bucket_size
+        else:
+            z_lo = z_hi = z_slice
+
+        mesh_shapes = self.walkable.shapes_between(z_lo - collision_config["walkable_below"], z_hi + collision_config["walkable_above"])
+        tolerance = collision_config["simplify_tolerance"] * player_radius
+        coll_slice = CollisionSlice(self.primitives.shapes_between(z_lo, z_hi), mesh_shapes, tolerance)
+        self.slices[key] = coll_slice
+        if len(self.slices) > self.MAX_SLICES:
+            self.slices.popitem(last=False)
+        return coll_slice
+
+    def vertex_report(self) -> dict[float | int, dict[str, tuple[int, int]]]:
+        """
+        Vertex counts of the whole-slice unions before and after simplification, as (before, after) per
+        union for every cached slice. Builds the unions of slices that do not have them yet.
+        """
+        report = {}
+        for key, coll_slice in self.slices.items():
+            coll_slice.free_area
+            report[key] = coll_slice.vertex_counts
+            before = sum(counts[0] for counts in coll_slice.vertex_counts.values())
+            after = sum(counts[1] for counts in coll_slice.vertex_counts.values())
+            zone_name = self.key[1] if self.key is not None else "zone"
+            logger.info(
+                f"{zone_name} slice {key}: {before} -> {after} union vertices "
+                f"(simplify tolerance {coll_slice.tolerance:g})"
+            )
+        return report
+
+    def occupancy_at(self, z_slice: float, player_radius: float = 0.0) -> Optional[OccupancyGrid]:
+        """The occupancy grid of the slice at this height, from the disk cache or rasterized on first use."""
+        coll_slice = self.slice_at(z_slice, player_radius)
+        if coll_slice.occupancy is not None:
+            return coll_slice.occupancy
+
+        cell_size = collision_config["grid_cell_size"]
+        use_disk_cache = self.key is not None and _use_disk_cache(self.key[0])
+        if use_disk_cache:
+            # Everything that shapes the slice goes into the tag, so a config change builds a new grid
+            grid_tag = hashlib.blake2b(repr((
+                self.slice_key(z_slice), collision_config["z_bucket_size"], collision_config["walkable_below"],
+                collision_config["walkable_above"], cell_size, coll_slice.tolerance,
+            )).encode(), digest_size=8).hexdigest()
+            coll_slice.occupancy = collision_disk_cache.load_grid(*self.key, grid_tag)
+
+        if coll_slice.occupancy is None:
+            coll_slice.occupancy = OccupancyGrid.from_slice(coll_slice, cell_size)
+            if use_disk_cache and coll_slice.occupancy is not None:
+                try:
+                    collision_disk_cache.save_grid(*self.key, grid_tag, coll_slice.occupancy)
+                except OSError as e:
+                    logger.error(f"Could not write occupancy grid for {self.key[1]}: {e}")
+        return coll_slice.occupancy
+
+
+def _world_filter() -> dict:
+    """Parse options for teleport use: only solid and walkable categories, without mesh normals."""
+    if not collision_config["filter_categories"]:
+        return {}
+    return {"categories": TELEPORT_CATEGORIES, "normals": False}
+
+
+def _parse_collision_world(raw_data: bytes) -> ColumnarWorld:
+    return ColumnarWorld.from_raw(raw_data, **_world_filter())
+
+
+async def _zone_key(client: Client) -> tuple[str, str]:
+    revision, zone_name = await get_revision_and_zone(client)
+    if zone_name == "unknown_zone":
+        zone_name = await client.zone_name()
+    return revision, zone_name
+
+
+def _use_disk_cache(revision: str) -> bool:
+    # The compiled cache is only trusted when we know which game revision it belongs to
+    return collision_disk_cache is not None and revision != "unknown_revision"
+
+
+def _load_cached_world(key: tuple[str, str], content_hash: str = None) -> Optional[ColumnarWorld]:
+    """
+    Loads a zone from the compiled disk cache, or None if it is not there. With the content hash of the
+    zone's bcd, only a file compiled from exactly that bcd is used.
+    """
+    revision, zone_name = key
+    if not _use_disk_cache(revision):
+        return None
+    return collision_disk_cache.load(revision, zone_name, content_hash=content_hash, **_world_filter())
+
+
+def _compile_world(key: tuple[str, str], raw: bytes) -> ColumnarWorld:
+    """Parses raw collision data and writes it to the disk cache."""
+    revision, zone_name = key
+    world = _parse_collision_world(raw)
+    if _use_disk_cache(revision):
+        try:
+            collision_disk_cache.save(revision, zone_name, raw, world)
+        except OSError as e:
+            logger.error(f"Could not write collision cache for {zone_name}: {e}")
+    return world
+
+
+async def _load_zone(client: Client, key: tuple[str, str]) -> ZoneCollision:
+    """Loads a zone from the disk cache or the game files. Parsing runs on a worker thread."""
+    world = await asyncio.to_thread(_load_cached_world, key, await game_data_hash(key[1]))
+    if world is None:
+        raw = await get_collision_data(client, key[1])
+        world = await asyncio.to_thread(_compile_world, key, raw)
+
+    zone = ZoneCollision(world, key)
+    collision_cache.put(key, zone)
+    return zone
+
+
+# Zone loads in flight, so a teleport and a prewarm of the same zone share one load
+_zone_loads: dict[tuple[str, str], asyncio.Task] = {}
+
+
+def _start_zone_load(client: Client, key: tuple[str, str]) -> asyncio.Task:
+    task = _zone_loads.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_load_zone(client, key))
+        _zone_loads[key] = task
+        task.add_done_callback(lambda _: _zone_loads.pop(key, None))
+    return task
+
+
+async def load_zone_collision(client: Client) -> tuple[tuple[str, str], ZoneCollision]:
+    """Returns the cache key and ZoneCollision for the client's current zone, using the in-process cache."""
+    key = await _zone_key(client)
+    zone = collision_cache.get(key)
+    if zone is not None:
+        return key, zone
+
+    task = _start_zone_load(client, key)
+    try:
+        return key, await asyncio.shield(task)
+    except asyncio.CancelledError:
+        if not task.cancelled():
+            raise
+        # A prewarm of this zone was cancelled underneath us, load it directly instead
+        return key, await _load_zone(client, key)
+
+
+async def load_collision_world(client: Client) -> CollisionWorld:
+    """Returns the parsed CollisionWorld for the client's current zone, rebuilt from its cached columns."""
+    _, zone = await load_zone_collision(client)
+    return zone.world.to_world()
+
+
+class EntityLayer:
+    """
+    Collision circles of a zone's dynamic entities, keyed by entity global id.
+    update() only rebuilds circles for entities that appeared, moved or changed radius.
+    """
+    def __init__(self):
+        self.gids = np.empty(0, dtype=np.uint64)
+        self.positions = np.empty((0, 2), dtype=np.float64)
+        self.radii = np.empty(0, dtype=np.float64)
+        self.shapes = np.empty(0, dtype=object)
+        self.rebuilt = 0
+
+    def __len__(self) -> int:
+        return len(self.gids)
+
+    @property
+    def nbytes(self) -> int:
+        return self.gids.nbytes + self.positions.nbytes + self.radii.nbytes + _geometry_nbytes(self.shapes)
+
+    @property
+    def bounds(self) -> Optional[tuple]:
+        if not len(self.gids):
+            return None
+        return (
+            float((self.positions[:, 0] - self.radii).min()), float((self.positions[:, 1] - self.radii).min()),
+            float((self.positions[:, 0] + self.radii).max()), float((self.positions[:, 1] + self.radii).max()),
+        )
+
+    def update(self, gids: np.ndarray, positions: np.ndarray, radii: np.ndarray) -> int:
+        """Replaces the layer with the given entities, reusing unchanged circles. Returns how many were rebuilt."""
+        gids = np.asarray(gids, dtype=np.uint64)
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        radii = np.asarray(radii, dtype=np.float64)
+
+        keep = radii > 0
+        gids, positions, radii = gids[keep], positions[keep], radii[keep]
+        order = np.argsort(gids, kind="stable")
+        gids, positions, radii = gids[order], positions[order], radii[order]
+
+        # self.gids is kept sorted, so previous entries are found with a binary search
+        slots = np.minimum(np.searchsorted(self.gids, gids), max(len(self.gids) - 1, 0))
+        unchanged = np.zeros(len(gids), dtype=bool)
+        if len(self.gids):
+            unchanged = (
+                (self.gids[slots] == gids)
+                & np.all(self.positions[slots] == positions, axis=1)
+                & (self.radii[slots] == radii)
+            )
+
+        shapes = np.empty(len(gids), dtype=object)
+        shapes[unchanged] = self.shapes[slots[unchanged]]
+        changed = ~unchanged
+        if changed.any():
+            shapes[changed] = shapely.buffer(
+                shapely.points(positions[changed]), radii[changed], quad_segs=CollisionPrimitives.CIRCLE_QUAD_SEGS
+            )
+
+        self.gids, self.positions, self.radii, self.shapes = gids, positions, radii, shapes
+        rebuilt = int(changed.sum())
+        self.rebuilt += rebuilt
+        return rebuilt
+
+    def shapes_near(self, geometry) -> np.ndarray:
+        """Entity circles intersecting the geometry, pre-filtered by circle bounds."""
+        if not len(self.gids):
+            return self.shapes
+        minx, miny, maxx, maxy = geometry.bounds
+        x, y = self.positions[:, 0], self.positions[:, 1]
+        close = (x + self.radii >= minx) & (x - self.radii <= maxx) & (y + self.radii >= miny) & (y - self.radii <= maxy)
+        candidates = self.shapes[close]
+        return candidates[shapely.intersects(candidates, geometry)]
+
+    def intersects(self, geometry) -> bool:
+        return len(self.shapes_near(geometry)) > 0
+
+    def segments_clear(self, segments: np.ndarray, radius: float) -> np.ndarray:
+        """For each (n, 2, 2) segment, True if a circle of radius can sweep along it without touching an entity."""
+        segments = np.asarray(segments, dtype=np.float64).reshape(-1, 2, 2)
+        if not len(self.gids) or not len(segments):
+            return np.ones(len(segments), dtype=bool)
+
+        # Distance from every entity center to every segment, segments along the first axis
+        start = segments[:, None, 0]
+        direction = segments[:, None, 1] - start
+        length_sq = np.maximum((direction ** 2).sum(axis=2), 1e-12)
+        t = np.clip(((self.positions[None] - start) * direction).sum(axis=2) / length_sq, 0, 1)
+        closest = start + t[..., None] * direction
+        distance = np.hypot(*(self.positions[None] - closest).transpose(2, 0, 1))
+        return ~(distance < self.radii[None] + radius).any(axis=1)
+
+
+def segments_clear(coll_slice: CollisionSlice, entities: EntityLayer, segments: np.ndarray, radius: float) -> np.ndarray:
+    """
+    Batched line of sight: for each (n, 2, 2) segment, True if a player of this radius can move straight
+    along it without touching static collision (via the slice's STRtree) or a dynamic entity.
+    """
+    clear = coll_slice.segments_clear(segments, radius)
+    if clear.any():
+        clear[clear] = entities.segments_clear(np.asarray(segments, dtype=np.float64).reshape(-1, 2, 2)[clear], radius)
+    return clear
+
+
+def segment_clear(coll_slice: CollisionSlice, entities: EntityLayer, a: tuple[float, float], b: tuple[float, float], radius: float) -> bool:
+    """True if a player of this radius can move straight from a to b without touching collision."""
+    return bool(segments_clear(coll_slice, entities, np.array([[a[:2], b[:2]]]), radius)[0])
+
+
+async def _read_single_entity(entity, static_body_radius: float, semaphore: asyncio.Semaphore) -> Optional[tuple[int, float, float, float]]:
+    """Reads one entity's (global id, x, y, radius), or None if it has no collision body."""
+    async with semaphore:
+        try:
+            entity_name, actor_body, gid = await asyncio.gather(
+                entity.object_name(), entity.actor_body(), entity.global_id_full()
+            )
+            if entity_name == "Player Object" or not actor_body:
+                return None
+
+            actor_type, entity_loc = await asyncio.gather(actor_body.read_type_name(), actor_body.position())
 
             if actor_type == "CharacterBody":
-                entity_height = await actor_body.height()
-                entity_scale = await actor_body.scale()
+                entity_height, entity_scale = await asyncio.gather(actor_body.height(), actor_body.scale())
                 entity_radius = entity_height * entity_scale * 0.5
                 #logger.debug(f"Calculating radius for '{entity_name}' (CharacterBody): {entity_radius:.2f}")
             else:
                 entity_radius = static_body_radius
                 #logger.debug(f"Applying static radius for '{entity_name}' ({actor_type}): {entity_radius:.2f}")
 
-            if entity_radius > 0:
-                entity_shapes.append(Point(entity_loc.x, entity_loc.y).buffer(entity_radius))
+        except Exception as e:
+            # Entities can despawn while being read, that only drops this one
+            logger.debug(f"Skipping entity while reading collision: {e}")
+            return None
+
+    if entity_radius <= 0:
+        return None
+    return gid, entity_loc.x, entity_loc.y, entity_radius
+
+
+async def _read_entity_collision(client: Client, static_body_radius: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Reads entity global ids, 2D positions and collision radii, with the memory reads of all entities
+    fanned out concurrently (bounded by entity_read_concurrency).
+    Uses a dynamic radius for 'CharacterBody' and a static default radius for other types.
+    """
+    #logger.debug("Getting dynamic entity collision shapes...")
+    results = []
+    try:
+        entity_list = await client.get_base_entity_list()
+        semaphore = asyncio.Semaphore(collision_config["entity_read_concurrency"])
+        results = await asyncio.gather(*[_read_single_entity(entity, static_body_radius, semaphore) for entity in entity_list])
 
     except Exception as e:
         logger.error(f"An error occurred while getting entity collision shapes: {e}", exc_info=True)
 
-    #logger.debug(f"Generated {len(entity_shapes)} collision shapes from dynamic entities.")
-    return entity_shapes
+    results = [result for result in results if result is not None]
+    return (
+        np.array([result[0] for result in results], dtype=np.uint64),
+        np.array([result[1:3] for result in results], dtype=np.float64).reshape(-1, 2),
+        np.array([result[3] for result in results], dtype=np.float64),
+    )
 
 
-async def _perform_single_teleport_attempt(
-        client: Client,
-        free_area: Polygon | MultiPolygon,
-        target: XYZ,
-        bounds: tuple,
-        base_player_radius: float,
-        player_radius_offset: float
-) -> bool:
-    """Performs a single, non-looping teleport attempt and verifies the result."""
-    epsilon = base_player_radius * 0.1
-    player_radius = base_player_radius * player_radius_offset
-    minx, miny, maxx, maxy = bounds
+def _local_free_area(coll_slice: CollisionSlice, entities: EntityLayer, window: Polygon) -> Polygon | MultiPolygon:
+    """Walkable area minus collision, built only from the shapes that touch the window and clipped to it."""
+    local_coll = list(coll_slice.coll_shapes_near(window))
+    local_coll += list(entities.shapes_near(window))
+    local_mesh = coll_slice.mesh_shapes_near(window)
+
+    union_mesh = unary_union(local_mesh).intersection(window) if len(local_mesh) else Polygon()
+    union_coll = unary_union(local_coll) if local_coll else Polygon()
+    return union_mesh.difference(union_coll)
 
-    #logger.debug(f"Performing teleport attempt with offset={player_radius_offset:.2f}, radius={player_radius:.2f}")
 
+def _full_free_area(coll_slice: CollisionSlice, entities: EntityLayer) -> Polygon | MultiPolygon:
+    """Walkable area minus collision over the whole zone, reusing the slice's cached static free area."""
+    if not len(entities):
+        return coll_slice.free_area
+    return coll_slice.free_area.difference(unary_union(entities.shapes))
+
+
+def _find_safe_point(free_area: Polygon | MultiPolygon, target: XYZ, player_radius: float, tolerance: float = 0.0) -> Optional[Point]:
+    """
+    Nearest point to the target where a circle of player_radius fits inside the free area, or None.
+    A free area simplified with some tolerance is eroded by that much more.
+    """
     if not free_area or free_area.is_empty:
-        logger.error("Free area is empty, cannot calculate a safe region.")
-        return False
+        return None
 
-    safe_region = free_area.buffer(-player_radius)
+    safe_region = free_area.buffer(-(player_radius + tolerance))
     if not safe_region or safe_region.is_empty:
-        logger.error("Safe region is empty after buffering. Cannot find a teleport point.")
-        return False
+        return None
 
     _, pt2 = nearest_points(Point(target.x, target.y), safe_region)
-    safe_pt = XYZ(pt2.x, pt2.y, target.z)
+    return pt2
+
+
+def _find_safe_point_windowed(
+        coll_slice: CollisionSlice,
+        entities: EntityLayer,
+        target: XYZ,
+        player_radius: float,
+        bounds: tuple
+) -> Optional[Point]:
+    """
+    Finds the same safe point as the full-zone computation, but only builds the free area and its
+    negative buffer inside a box around the target, growing the box until the answer is proven.
+
+    Clipping to a box of half-size h only removes safe points whose player circle would leave the box,
+    so if the nearest safe point p inside the box satisfies dist(target, p) + player_radius <= h, no
+    safe point outside the box can be closer and p is the global answer.
+    """
+    half_size = collision_config["search_radius"]
+    growth = collision_config["search_growth"]
+
+    # Once the box covers every shape (plus the player circle) the clip is a no-op
+    minx, miny, maxx, maxy = bounds
+    if len(entities):
+        eminx, eminy, emaxx, emaxy = entities.bounds
+        minx, miny, maxx, maxy = min(minx, eminx), min(miny, eminy), max(maxx, emaxx), max(maxy, emaxy)
+    covering_size = max(target.x - minx, maxx - target.x, target.y - miny, maxy - target.y) + player_radius
+
+    while True:
+        window = box(target.x - half_size, target.y - half_size, target.x + half_size, target.y + half_size)
+        safe_point = _find_safe_point(_local_free_area(coll_slice, entities, window), target, player_radius)
+
+        if half_size >= covering_size:
+            return safe_point
+        if safe_point is not None and math.dist((target.x, target.y), (safe_point.x, safe_point.y)) + player_radius <= half_size:
+            return safe_point
+
+        #logger.debug(f"No proven safe point within {half_size:.0f} units, growing search window.")
+        half_size *= growth
+
+
+@dataclass
+class TeleportSolution:
+    """Outcome of the geometry stage of WorldsCollideTP."""
+    status: str  # "clear", "safe", "blocked", "no_geometry", "path", "no_path", "warm", "missing" or "skipped"
+    point: Optional[tuple[float, float]] = None
+    bounds: Optional[tuple] = None
+    path: Optional[list[Vector3D]] = None
+    z: Optional[float] = None  # floor height at the landing point, when snap_to_floor is on
+    cache_stats: Optional[dict] = None  # the geometry worker's collision_cache.stats(), with its "pid"
+
+
+def solve_teleport(coll_slice: CollisionSlice, entities: EntityLayer, target: XYZ, player_radius: float) -> TeleportSolution:
+    """
+    Pure geometry stage of WorldsCollideTP: checks whether the player fits at the target and otherwise
+    finds the nearest safe point. Touches no client state, so it can run in a worker process.
+    """
+    bounds = coll_slice.bounds
+    if bounds is None:
+        bounds = entities.bounds
+    if bounds is None:
+        return TeleportSolution("no_geometry")
+    #logger.debug(f"Instance bounds: X[{bounds[0]:.1f},{bounds[2]:.1f}]  Y[{bounds[1]:.1f},{bounds[3]:.1f}]")
+
+    player_at_target = Point(target.x, target.y).buffer(player_radius)
+
+    # Only the static shapes the STRtree reports near the target are tested
+    blocked = coll_slice.intersects(player_at_target) or entities.intersects(player_at_target)
+    if not blocked:
+        return TeleportSolution("clear", bounds=bounds)
+
+    if collision_config["safe_point_mode"] == "grid" and coll_slice.occupancy is not None:
+        safe_point = coll_slice.occupancy.find_safe_point(target, player_radius, entities)
+    elif collision_config["windowed_free_area"]:
+        safe_point = _find_safe_point_windowed(coll_slice, entities, target, player_radius, bounds)
+    else:
+        safe_point = _find_safe_point(_full_free_area(coll_slice, entities), target, player_radius, coll_slice.tolerance)
+    if safe_point is None:
+        return TeleportSolution("blocked", bounds=bounds)
+    if isinstance(safe_point, Point):
+        safe_point = (safe_point.x, safe_point.y)
+    return TeleportSolution("safe", safe_point, bounds)
+
+
+@dataclass
+class GeometryRequest:
+    """
+    One call into the geometry stage. Per call only the target, radius and entity arrays are sent;
+    raw_data is attached only when a worker reports that it does not have the zone yet.
+    A request without a target just builds the slice at z_slice (used for prewarming), and a request
+    with a start plans a navigation path from start to target instead.
+    """
+    key: tuple[str, str]
+    z_slice: float
+    target: Optional[Vector3D] = None
+    player_radius: float = 0.0
+    gids: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.uint64))
+    positions: np.ndarray = field(default_factory=lambda: np.empty((0, 2), dtype=np.float64))
+    radii: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float64))
+    raw_data: Optional[bytes] = None
+    start: Optional[Vector3D] = None
+    content_hash: Optional[str] = None  # hash of the zone's bcd, when known (see game_data_hash)
+
+
+def plan_path(zone: ZoneCollision, request: GeometryRequest) -> TeleportSolution:
+    """Plans teleport hops from request.start to request.target over the slice's cached navigation graph."""
+    grid = zone.occupancy_at(request.z_slice, request.player_radius)
+    if grid is None:
+        return TeleportSolution("no_path")
+
+    graph = grid.nav_graph(request.player_radius, collision_config["nav_node_size"])
+    coll_slice = zone.slice_at(request.z_slice, request.player_radius)
+    zone.entities.update(request.gids, request.positions, request.radii)
+
+    def lines_clear(a: tuple[float, float], ends: np.ndarray) -> np.ndarray:
+        # Shortcuts are also checked against the exact geometry and the entities standing in the way
+        segments = np.stack([np.broadcast_to(a, ends.shape), ends], axis=1)
+        return segments_clear(coll_slice, zone.entities, segments, request.player_radius)
+
+    waypoints = graph.find_path(request.start[:2], request.target[:2], lines_clear)
+    if waypoints is None:
+        return TeleportSolution("no_path")
+
+    z = request.target[2]
+    hops = _split_hops(waypoints, request.start[:2], collision_config["nav_hop_distance"])
+    if collision_config["snap_to_floor"]:
+        return TeleportSolution("path", path=[(x, y, zone.snap_z(x, y, z)) for x, y in hops])
+    return TeleportSolution("path", path=[(x, y, z) for x, y in hops])
+
+
+def _solve_zone_request(zone: ZoneCollision, request: GeometryRequest) -> TeleportSolution:
+    coll_slice = zone.slice_at(request.z_slice, request.player_radius)
+    if collision_config["safe_point_mode"] == "grid":
+        zone.occupancy_at(request.z_slice, request.player_radius)
+    if request.target is None:
+        return TeleportSolution("warm")
+    if request.start is not None:
+        return plan_path(zone, request)
+
+    zone.entities.update(request.gids, request.positions, request.radii)
+    solution = solve_teleport(coll_slice, zone.entities, XYZ(*request.target), request.player_radius)
+    if collision_config["snap_to_floor"] and solution.status in ("clear", "safe"):
+        x, y = solution.point or request.target[:2]
+        solution.z = zone.snap_z(x, y, request.target[2])
+    return solution
+
+
+def solve_geometry_request(request: GeometryRequest) -> TeleportSolution:
+    """
+    Geometry worker entry point. Each worker process keeps its own collision_cache of zones, filled from
+    the compiled disk cache or the request's raw_data, and answers "missing" when it has neither.
+    """
+    zone = None
+    # A request carrying raw_data retries one that came back "missing", which was already counted as a miss
+    if request.raw_data is None or request.key in collision_cache:
+        zone = collision_cache.get(request.key)
+    cached = zone is not None
+    if zone is None:
+        world = _load_cached_world(request.key, request.content_hash)
+        if world is None:
+            if request.raw_data is None:
+                return TeleportSolution("missing")
+            world = _compile_world(request.key, request.raw_data)
+        zone = ZoneCollision(world, request.key)
+
+    new_slice = zone.slice_key(request.z_slice) not in zone.slices
+    solution = _solve_zone_request(zone, request)
+    if not cached or new_slice:
+        # (Re)size the entry now that the slice geometry counts against the budget
+        collision_cache.put(request.key, zone)
+    solution.cache_stats = {"pid": os.getpid(), **collision_cache.stats()}
+    return solution
+
+
+_geometry_pool: Optional[ProcessPoolExecutor] = None
+# The collision_cache counters each geometry worker reported with its last solution, by process id
+_worker_cache_stats: dict[int, dict] = {}
+
+
+def collision_cache_stats() -> dict:
+    """
+    Zone cache counters summed over this process and the geometry workers, with each process's own
+    stats under "processes". With geometry_process_pool on, zones are only cached in the workers.
+    """
+    processes = {"main": collision_cache.stats(), **_worker_cache_stats}
+    totals = {
+        name: sum(stats[name] for stats in processes.values())
+        for name in ("hits", "misses", "entries", "current_bytes")
+    }
+    return {**totals, "processes": processes}
+
+
+def _get_geometry_pool() -> ProcessPoolExecutor:
+    global _geometry_pool
+    if _geometry_pool is None:
+        _geometry_pool = ProcessPoolExecutor(max_workers=collision_config["geometry_workers"])
+    return _geometry_pool
+
+
+async def _solve_in_pool(
+        client: Client,
+        request: GeometryRequest,
+        still_wanted: Callable[[], Awaitable[bool]] = None
+) -> Optional[TeleportSolution]:
+    """
+    Runs the request in the geometry worker pool, or returns None if the pool has died. Before each
+    submit, still_wanted (if given) can call the request off, which answers "skipped".
+    """
+    global _geometry_pool
+    loop = asyncio.get_running_loop()
+    try:
+        request.content_hash = await game_data_hash(request.key[1])
+        if still_wanted is not None and not await still_wanted():
+            return TeleportSolution("skipped")
+        solution = await loop.run_in_executor(_get_geometry_pool(), solve_geometry_request, request)
+        if solution.status == "missing":
+            if still_wanted is not None and not await still_wanted():
+                return TeleportSolution("skipped")
+            request.raw_data = await get_collision_data(client, request.key[1])
+            solution = await loop.run_in_executor(_get_geometry_pool(), solve_geometry_request, request)
+        stats = dict(solution.cache_stats)
+        _worker_cache_stats[stats.pop("pid")] = stats
+        return solution
+
+    except BrokenProcessPool as e:
+        logger.error(f"Collision geometry worker stopped, falling back to in-process geometry: {e}")
+        _geometry_pool = None
+        return None
+
+
+async def _solve_zone_locked(zone: ZoneCollision, request: GeometryRequest) -> TeleportSolution:
+    """
+    Solves a request on a worker thread while holding the zone's build lock, so a prewarm and a teleport
+    in the same zone never build its lazy slices, grids or floor side by side.
+    """
+    def solve() -> TeleportSolution:
+        with zone.build_lock:
+            return _solve_zone_request(zone, request)
+    return await asyncio.to_thread(solve)
+
+
+async def _solve_in_process(client: Client, request: GeometryRequest) -> TeleportSolution:
+    key, zone = await load_zone_collision(client)
+
+    new_slice = zone.slice_key(request.z_slice) not in zone.slices
+    solution = await _solve_zone_locked(zone, request)
+    if new_slice:
+        # Refresh the entry size now that the slice geometry counts against the budget
+        collision_cache.put(key, zone)
+    return solution
+
+
+async def solve_geometry(
+        client: Client,
+        request: GeometryRequest,
+        still_wanted: Callable[[], Awaitable[bool]] = None
+) -> TeleportSolution:
+    """
+    Runs the geometry stage for a request, in the geometry process pool when enabled so the event loop
+    (and the UI) stays responsive, otherwise in this process. still_wanted is checked before each
+    pool submit, so background requests stop queueing work once they are stale.
+    """
+    if collision_config["geometry_process_pool"]:
+        solution = await _solve_in_pool(client, request, still_wanted)
+        if solution is not None:
+            return solution
+    return await _solve_in_process(client, request)
+
+
+async def _perform_single_teleport_attempt(
+        client: Client,
+        safe_point: tuple[float, float],
+        target: XYZ,
+        bounds: Optional[tuple],
+        base_player_radius: float
+) -> bool:
+    """Performs a single, non-looping teleport attempt and verifies the result."""
+    epsilon = base_player_radius * 0.1
+
+    safe_pt = XYZ(*safe_point, target.z)
     #logger.debug(f"Calculated candidate safe_pt: {safe_pt}")
 
-    cx = min(max(safe_pt.x, minx), maxx)
-    cy = min(max(safe_pt.y, miny), maxy)
-    safe_pt = XYZ(cx, cy, safe_pt.z)
-    #logger.debug(f"Clamped safe_pt to instance bounds: {safe_pt}")
+    if bounds is not None:
+        minx, miny, maxx, maxy = bounds
+        cx = min(max(safe_pt.x, minx), maxx)
+        cy = min(max(safe_pt.y, miny), maxy)
+        safe_pt = XYZ(cx, cy, safe_pt.z)
+        #logger.debug(f"Clamped safe_pt to instance bounds: {safe_pt}")
 
     start_zone_name = await client.zone_name()
     await client.teleport(safe_pt)
@@ -572,6 +2874,97 @@ async def _perform_single_teleport_attempt(
         return False
 
 
+async def _player_radius(client: Client, player_radius_offset: float = 0.5) -> tuple[float, float]:
+    """Returns the player's collision radius and the radius with the offset applied."""
+    player_height = await client.body.height()
+    player_scale = await client.body.scale()
+    base_player_radius = player_height * player_scale * 0.5
+    return base_player_radius, base_player_radius * player_radius_offset
+
+
+async def navigate_to(
+        client: Client,
+        target: XYZ,
+        player_radius: float,
+        base_player_radius: float,
+        static_body_radius: float = 75.0
+) -> bool:
+    """
+    Plans a path from the player to the target over the zone's navigation graph and teleports along it
+    hop by hop, verifying every hop. Returns True once the target is reached or the zone changes.
+    """
+    start = await client.body.position()
+    key = await _zone_key(client)
+    gids, positions, radii = await _read_entity_collision(client, static_body_radius)
+    solution = await solve_geometry(client, GeometryRequest(
+        key, target.z, (target.x, target.y, target.z), player_radius, gids, positions, radii,
+        start=(start.x, start.y, start.z),
+    ))
+    if solution.status != "path":
+        logger.error("No navigation path to the target was found.")
+        return False
+
+    logger.info(f"Navigating to the target in {len(solution.path)} hops.")
+    start_zone_name = await client.zone_name()
+    for x, y, z in solution.path:
+        if not await _perform_single_teleport_attempt(client, (x, y), XYZ(x, y, z), None, base_player_radius):
+            logger.error(f"Navigation hop to ({x:.1f}, {y:.1f}) failed.")
+            return False
+        if await client.zone_name() != start_zone_name:
+            return True
+    return True
+
+
+# Background checks of direct teleports, at most one per client; a newer teleport cancels the older check
+_teleport_checks: dict[Client, asyncio.Task] = {}
+
+
+def cancel_teleport_check(client: Client):
+    """
+    Drops the pending rubber-band check of the client's last direct teleport. Call it before moving the
+    client any other way, or the check would take that move for a rubber-band and navigate back.
+    """
+    check = _teleport_checks.pop(client, None)
+    if check is not None:
+        check.cancel()
+
+
+async def _retry_if_rubber_banded(
+        client: Client,
+        start: XYZ,
+        landed: XYZ,
+        target: XYZ,
+        zone_name: str,
+        player_radius: float,
+        base_player_radius: float,
+        static_body_radius: float
+):
+    """
+    Checks a direct teleport once the server has had time to answer, and retries it along a navigation
+    path when the server put the player back where they started. landed is the position read right
+    after the teleport, so a teleport that never left the start is not retried.
+    """
+    epsilon = base_player_radius * 0.1
+    try:
+        if math.dist((landed.x, landed.y), (start.x, start.y)) <= epsilon:
+            return
+
+        await asyncio.sleep(0.5)
+        if await client.is_loading() or await client.zone_name() != zone_name:
+            return
+
+        position = await client.body.position()
+        if math.dist((position.x, position.y), (start.x, start.y)) > epsilon:
+            return
+
+        logger.info("Retrying the rubber-banded teleport along a navigation path.")
+        await navigate_to(client, target, player_radius, base_player_radius, static_body_radius)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error(f"Checking the teleport for rubber-banding failed: {e}")
+
+
 async def WorldsCollideTP(
         client: Client,
         target_position: XYZ,
@@ -583,126 +2976,741 @@ async def WorldsCollideTP(
     including dynamic entities. Returns True if successful, False otherwise.
     """
     try:
+        cancel_teleport_check(client)
         player_pos = await client.body.position()
         #logger.debug(f"Player position: {player_pos}")
         #logger.debug(f"Target position: {target_position}")
 
-        world, static_coll_shapes, mesh_shapes = await _load_and_build_collision_geometry(client, target_position.z)
-        entity_coll_shapes = await _get_entity_collision_shapes(client, static_body_radius)
+        key = await _zone_key(client)
 
-        all_coll_shapes = static_coll_shapes + entity_coll_shapes
-        #logger.debug(f"Total collision objects (static + dynamic): {len(all_coll_shapes)}")
+        start = time.perf_counter()
+        gids, positions, radii = await _read_entity_collision(client, static_body_radius)
+        read_time = time.perf_counter() - start
 
-        union_all_coll = unary_union(all_coll_shapes) if all_coll_shapes else Polygon()
-        union_mesh = unary_union(mesh_shapes) if mesh_shapes else Polygon()
+        # Check for intersection using the player's actual radius
+        base_player_radius, player_radius = await _player_radius(client, player_radius_offset)
+        #logger.debug(f"Estimated player radius (offset applied): {player_radius:.2f}")
 
-        free_area = union_mesh.difference(union_all_coll)
+        start = time.perf_counter()
+        solution = await solve_geometry(client, GeometryRequest(
+            key, target_position.z, (target_position.x, target_position.y, target_position.z),
+            player_radius, gids, positions, radii,
+        ))
+        logger.debug(
+            f"Collision geometry: {len(gids)} entities read in {read_time * 1000:.1f} ms, "
+            f"solved ({solution.status}) in {(time.perf_counter() - start) * 1000:.1f} ms."
+        )
 
-        bounds_geom = union_mesh if not union_mesh.is_empty else union_all_coll
-        if bounds_geom.is_empty:
+        if solution.status == "no_geometry":
             #logger.error("No geometry (mesh or collision) found to define zone boundaries. Aborting.")
             return False
-        bounds = bounds_geom.bounds
-        #logger.debug(f"Instance bounds: X[{bounds[0]:.1f},{bounds[2]:.1f}]  Y[{bounds[1]:.1f},{bounds[3]:.1f}]")
 
-        # Check for intersection using the player's actual radius
-        player_height = await client.body.height()
-        player_scale = await client.body.scale()
-        base_player_radius = player_height * player_scale * 0.5
-        player_radius = base_player_radius * player_radius_offset
-        #logger.debug(f"Estimated player radius (offset applied): {player_radius:.2f}")
+        # Land on the floor under the landing point rather than at the requested height
+        landing_z = target_position.z if solution.z is None else solution.z
 
-        player_at_target = Point(target_position.x, target_position.y).buffer(player_radius)
-
-        if not union_all_coll.intersects(player_at_target):
+        if solution.status == "clear":
             #logger.info("Target position is clear of all known collision objects. Attempting direct teleport...")
-            await client.teleport(target_position)
+            landing = XYZ(target_position.x, target_position.y, landing_z)
+            await client.teleport(landing)
+            if collision_config["navigation"]:
+                # Checked in the background, so a clear teleport returns as soon as it is sent
+                landed = await client.body.position()
+                _teleport_checks[client] = asyncio.ensure_future(_retry_if_rubber_banded(
+                    client, player_pos, landed, target_position, key[1],
+                    player_radius, base_player_radius, static_body_radius
+                ))
             return True
 
         #logger.info("Target position intersects with collision objects. Calculating safe teleport point.")
 
+        if solution.status != "safe":
+            logger.error("Safe region is empty after buffering. Cannot find a teleport point.")
+            return False
+
         success = await _perform_single_teleport_attempt(
-            client, free_area, target_position, bounds, base_player_radius, player_radius_offset
+            client, solution.point, XYZ(*solution.point, landing_z), solution.bounds, base_player_radius
         )
 
         if success:
             #logger.info("Collision-based teleportation was successful.")
             return True
-        else:
-            logger.error("Collision-based teleportation failed.")
-            return False
+
+        if collision_config["navigation"]:
+            logger.info("Retrying the rubber-banded teleport along a navigation path.")
+            safe_pt = XYZ(*solution.point, landing_z)
+            if await navigate_to(client, safe_pt, player_radius, base_player_radius, static_body_radius):
+                return True
+
+        logger.error("Collision-based teleportation failed.")
+        return False
 
     except Exception as e:
         logger.error(f"WorldsCollideTP failed with error: {e}", exc_info=True)
         return False
 
 
-def build_collision_shapes(world: CollisionWorld, z_slice: float) -> List[Polygon]:
+class ZIntervalIndex:
+    """
+    Centered interval tree over the vertical extents of collision primitives.
+    query(z_lo, z_hi) returns the ids of every extent overlapping [z_lo, z_hi] in O(log n + k).
+    """
+    LEAF_SIZE = 32
+
+    def __init__(self, z_ranges: np.ndarray, ids: np.ndarray = None):
+        self.z_ranges = np.asarray(z_ranges, dtype=np.float64).reshape(-1, 2)
+        if ids is None:
+            ids = np.arange(len(self.z_ranges))
+
+        # Each node: (center, ids by lo, sorted lo, ids by hi, sorted hi, left, right); leaves have center None
+        self._nodes: list[tuple] = []
+        self._root = self._build(np.asarray(ids, dtype=np.int64))
+
+    def __len__(self) -> int:
+        return len(self.z_ranges)
+
+    def _build(self, ids: np.ndarray) -> int:
+        if len(ids) == 0:
+            return -1
+
+        lo, hi = self.z_ranges[ids, 0], self.z_ranges[ids, 1]
+        if len(ids) <= self.LEAF_SIZE:
+            self._nodes.append((None, ids, lo, ids, hi, -1, -1))
+            return len(self._nodes) - 1
+
+        # The extent whose midpoint is the median always contains the center, so every node makes progress
+        center = float(np.median((lo + hi) / 2))
+        here = (lo <= center) & (center <= hi)
+        by_lo = np.argsort(lo[here], kind="stable")
+        by_hi = np.argsort(hi[here], kind="stable")
+        here_ids = ids[here]
+
+        node_index = len(self._nodes)
+        self._nodes.append(None)
+        left = self._build(ids[hi < center])
+        right = self._build(ids[lo > center])
+        self._nodes[node_index] = (
+            center,
+            here_ids[by_lo], lo[here][by_lo],
+            here_ids[by_hi], hi[here][by_hi],
+            left, right,
+        )
+        return node_index
+
+    def query(self, z_lo: float, z_hi: float = None) -> np.ndarray:
+        if z_hi is None:
+            z_hi = z_lo
+
+        found = []
+        stack = [self._root]
+        while stack:
+            node_index = stack.pop()
+            if node_index < 0:
+                continue
+            center, ids_by_lo, sorted_lo, ids_by_hi, sorted_hi, left, right = self._nodes[node_index]
+
+            if center is None:
+                found.append(ids_by_lo[(sorted_lo <= z_hi) & (z_lo <= sorted_hi)])
+            elif z_hi < center:
+                # Everything stored here reaches the center, so only the bottom end needs checking
+                found.append(ids_by_lo[:np.searchsorted(sorted_lo, z_hi, side="right")])
+                stack.append(left)
+            elif z_lo > center:
+                found.append(ids_by_hi[np.searchsorted(sorted_hi, z_lo, side="left"):])
+                stack.append(right)
+            else:
+                found.append(ids_by_lo)
+                stack.append(left)
+                stack.append(right)
+
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(found))
+
+
+class CollisionPrimitives:
+    """
+    Per-zone parameter arrays for the boxes, spheres and cylinders of a zone, taken from its ColumnarWorld.
+
+    The 2D footprint of a primitive does not depend on the slice height, only whether it is included does,
+    so footprints are built once with shapely's vectorized constructors and each slice is just a z mask.
+    """
+    # Same resolution as Point.buffer()
+    CIRCLE_QUAD_SEGS = 16
+
+    def __init__(self, world: "ColumnarWorld | CollisionWorld"):
+        world = _columnar(world)
+        boxes = world.types == ProxyType.BOX.value
+        spheres = world.types == ProxyType.SPHERE.value
+        cylinders = world.types == ProxyType.CYLINDER.value
+        scales = world.scales.astype(np.float64)
+        params = world.params.astype(np.float64)
+
+        self.box_dimensions = params[boxes, :3]
+        self.box_locations = world.locations[boxes].astype(np.float64)
+        self.box_rotations = world.rotations[boxes].astype(np.float64)
+        half_depth = self.box_dimensions[:, 2] / 2
+        self.box_z_range = np.stack([self.box_locations[:, 2] - half_depth, self.box_locations[:, 2] + half_depth], axis=1)
+
+        self.sphere_locations = world.locations[spheres].astype(np.float64)
+        self.sphere_radii = params[spheres, 0] * scales[spheres]
+        self.sphere_z_range = np.stack([self.sphere_locations[:, 2] - self.sphere_radii, self.sphere_locations[:, 2] + self.sphere_radii], axis=1)
+
+        # Scale is a single float in the file, so it applies to every axis
+        self.cylinder_locations = world.locations[cylinders].astype(np.float64)
+        cylinder_half_lengths = params[cylinders, 1] / 2 * scales[cylinders]
+        self.cylinder_radii = params[cylinders, 0] * scales[cylinders] * 0.125
+        self.cylinder_z_range = np.stack([self.cylinder_locations[:, 2] - cylinder_half_lengths, self.cylinder_locations[:, 2] + cylinder_half_lengths], axis=1)
+
+        self._footprints = None
+        self._all_footprints = None
+        self._interval_index = None
+
+    @property
+    def footprints(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """2D shapes of every box, sphere and cylinder, built on first use."""
+        if self._footprints is None:
+            world_pts = transformPointsBatch(toCubeVerticesBatch(self.box_dimensions), self.box_locations, self.box_rotations)
+            box_shapes = shapely.convex_hull(shapely.multipoints(world_pts[:, :, :2])) if len(world_pts) else np.empty(0, dtype=object)
+
+            sphere_shapes = shapely.buffer(
+                shapely.points(self.sphere_locations[:, :2]), self.sphere_radii, quad_segs=self.CIRCLE_QUAD_SEGS
+            ) if len(self.sphere_radii) else np.empty(0, dtype=object)
+            cylinder_shapes = shapely.buffer(
+                shapely.points(self.cylinder_locations[:, :2]), self.cylinder_radii, quad_segs=self.CIRCLE_QUAD_SEGS
+            ) if len(self.cylinder_radii) else np.empty(0, dtype=object)
+
+            self._footprints = (box_shapes, sphere_shapes, cylinder_shapes)
+        return self._footprints
+
+    @property
+    def nbytes(self) -> int:
+        size = sum(array.nbytes for array in vars(self).values() if isinstance(array, np.ndarray))
+        if self._footprints is not None:
+            size += sum(_geometry_nbytes(shapes) for shapes in self._footprints)
+        return size
+
+    @property
+    def interval_index(self) -> ZIntervalIndex:
+        """Interval index over boxes, then spheres, then cylinders, in footprint order."""
+        if self._interval_index is None:
+            z_ranges = np.concatenate([self.box_z_range, self.sphere_z_range, self.cylinder_z_range])
+            valid = np.concatenate([np.ones(len(self.box_z_range), dtype=bool), self.sphere_radii > 0, self.cylinder_radii > 0])
+            self._interval_index = ZIntervalIndex(z_ranges, np.flatnonzero(valid))
+        return self._interval_index
+
+    def shapes_between(self, z_lo: float, z_hi: float) -> List[Polygon]:
+        """Footprints of every primitive whose vertical extent overlaps [z_lo, z_hi]."""
+        if self._all_footprints is None:
+            self._all_footprints = np.concatenate(self.footprints)
+        return self._all_footprints[self.interval_index.query(z_lo, z_hi)].tolist()
+
+    def shapes_at(self, z_slice: float) -> List[Polygon]:
+        return self.shapes_between(z_slice, z_slice)
+
+
+def build_collision_shapes(world: "ColumnarWorld | CollisionWorld", z_slice: float) -> List[Polygon]:
     """Build 2D collision shapes from the collision world"""
-    shapes = []
+    return CollisionPrimitives(world).shapes_at(z_slice)
+
+
+def _clip_polygons_z(polygons: np.ndarray, counts: np.ndarray, bound: float, keep_above: bool) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized Sutherland-Hodgman clip of many convex polygons against the plane z = bound.
+    polygons is (N, K, 3) padded with counts valid vertices per row; returns (N, K + 1, 3) and new counts.
+    """
+    count, width = polygons.shape[:2]
+    rows = np.arange(count)
+    out = np.zeros((count, 2 * width, 3))
+    keep = np.zeros((count, 2 * width), dtype=bool)
+
+    for i in range(width):
+        valid = i < counts
+        current = polygons[:, i]
+        following = polygons[rows, np.where(i + 1 < counts, i + 1, 0)]
+
+        current_inside = current[:, 2] >= bound if keep_above else current[:, 2] <= bound
+        following_inside = following[:, 2] >= bound if keep_above else following[:, 2] <= bound
+
+        # Interpolate from the lower endpoint so triangles sharing an edge get the exact same point
+        swap = (current[:, 2] > following[:, 2])[:, None]
+        lower = np.where(swap, following, current)
+        upper = np.where(swap, current, following)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = (bound - lower[:, 2]) / (upper[:, 2] - lower[:, 2])
+            crossing = lower + t[:, None] * (upper - lower)
+        crossing[:, 2] = bound
+
+        out[:, 2 * i] = current
+        keep[:, 2 * i] = valid & current_inside
+        out[:, 2 * i + 1] = crossing
+        keep[:, 2 * i + 1] = valid & (current_inside != following_inside)
+
+    order = np.argsort(~keep, axis=1, kind="stable")[:, :width + 1]
+    return np.take_along_axis(out, order[:, :, None], axis=1), keep.sum(axis=1)
+
+
+class WalkableTriangles:
+    """
+    World-space triangles of a zone's walkable meshes. shapes_between() slices them exactly against
+    a horizontal band, giving the real walkable cross-section instead of each mesh's convex hull.
+    Zones without any WALKABLE mesh fall back to using every mesh.
+    """
+    # Slivers from near-vertical triangles are dropped
+    MIN_AREA = 1e-6
+
+    def __init__(self, world: "ColumnarWorld | CollisionWorld"):
+        world = _columnar(world)
+        mesh_rows = world.mesh_rows()
+        objects, vertex_starts, vertex_ends, face_starts, face_ends = mesh_rows.T
+        meshes = mesh_rows[(vertex_ends - vertex_starts >= 3) & (face_ends > face_starts)]
+        walkable = meshes[(world.category_bits[meshes[:, 0]] & CollisionFlag.WALKABLE.value) != 0]
+        meshes = walkable if len(walkable) else meshes
+
+        if not len(meshes):
+            self.triangles = np.zeros((0, 3, 3))
+        else:
+            objects, vertex_starts, vertex_ends, face_starts, face_ends = meshes.T
+            # Every mesh vertex is transformed in one shot, with each vertex carrying its mesh's rotation
+            vertex_index = _ranges(vertex_starts, vertex_ends)
+            mesh_index = np.repeat(np.arange(len(meshes)), vertex_ends - vertex_starts)
+            vertices = world.vertices[vertex_index].astype(np.float64)
+            rotations = toMultidimBatch(world.rotations[objects])[mesh_index]
+            locations = world.locations[objects].astype(np.float64)[mesh_index]
+            pts3d = np.einsum("vj,vji->vi", vertices, rotations) + locations
+
+            # Face indices are local to their mesh; shift them to where the mesh's vertices landed
+            face_counts = face_ends - face_starts
+            vertex_offsets = np.concatenate([[0], np.cumsum(vertex_ends - vertex_starts)[:-1]])
+            faces = world.mesh_faces[_ranges(face_starts, face_ends)] + np.repeat(vertex_offsets, face_counts)[:, None]
+            self.triangles = pts3d[faces]
+
+        self.z_min = self.triangles[:, :, 2].min(axis=1) if len(self.triangles) else np.zeros(0)
+        self.z_max = self.triangles[:, :, 2].max(axis=1) if len(self.triangles) else np.zeros(0)
+
+    @property
+    def nbytes(self) -> int:
+        return self.triangles.nbytes + self.z_min.nbytes + self.z_max.nbytes
+
+    def shapes_between(self, z_lo: float, z_hi: float) -> List[Polygon]:
+        """2D footprints of the walkable surface between z_lo and z_hi, one polygon per (clipped) triangle."""
+        candidates = np.flatnonzero((self.z_max >= z_lo) & (self.z_min <= z_hi))
+        if not len(candidates):
+            return []
+
+        polygons = self.triangles[candidates]
+        counts = np.full(len(polygons), 3)
+        partial = (self.z_min[candidates] < z_lo) | (self.z_max[candidates] > z_hi)
+        if partial.any():
+            padded = np.zeros((len(polygons), 5, 3))
+            padded[:, :3] = polygons
+            clipped, clipped_counts = _clip_polygons_z(polygons[partial], counts[partial], z_lo, keep_above=True)
+            clipped, clipped_counts = _clip_polygons_z(clipped, clipped_counts, z_hi, keep_above=False)
+            padded[partial] = clipped[:, :5]
+            counts[partial] = clipped_counts
+            polygons = padded
+
+        polygons, counts = polygons[counts >= 3], counts[counts >= 3]
+        if not len(polygons):
+            return []
+
+        # Ragged rings straight from the padded arrays
+        vertex_mask = np.arange(polygons.shape[1]) < counts[:, None]
+        ring_index = np.repeat(np.arange(len(polygons)), counts)
+        rings = shapely.linearrings(polygons[vertex_mask][:, :2], indices=ring_index)
+        shapes = shapely.polygons(rings)
+        return shapes[shapely.area(shapes) > self.MIN_AREA].tolist()
+
+
+class FloorBVH:
+    """
+    Bounding volume hierarchy over a zone's walkable triangles for vertical raycasts.
+
+    Triangles are ordered along a Morton curve of their xy centers and grouped into leaves of LEAF_SIZE;
+    every level above pairs up the boxes below it, so the whole tree is a list of (lo, hi) box arrays
+    built with a handful of numpy reductions. A query walks the levels keeping only the boxes that
+    contain (x, y) and reach the height band, then tests the few triangles left.
+    """
+    LEAF_SIZE = 8
+    FIRST_LEVEL_SIZE = 1024
+    # Triangles this close to vertical have no usable floor height
+    MIN_XY_AREA = 1e-6
+
+    def __init__(self, triangles: np.ndarray):
+        triangles = np.asarray(triangles, dtype=np.float64).reshape(-1, 3, 3)
+        edge_a, edge_b = triangles[:, 1, :2] - triangles[:, 0, :2], triangles[:, 2, :2] - triangles[:, 0, :2]
+        triangles = triangles[np.abs(edge_a[:, 0] * edge_b[:, 1] - edge_a[:, 1] * edge_b[:, 0]) > self.MIN_XY_AREA]
+
+        self.triangles = triangles[self._morton_order(triangles)] if len(triangles) else triangles
+        self.levels: list[np.ndarray] = []
+        if not len(self.triangles):
+            return
+
+        # Each level holds one (lo x, lo y, lo z, hi x, hi y, hi z) box per node
+        starts = np.arange(0, len(self.triangles), self.LEAF_SIZE)
+        boxes = np.hstack([
+            np.minimum.reduceat(self.triangles.min(axis=1), starts),
+            np.maximum.reduceat(self.triangles.max(axis=1), starts),
+        ])
+        self.levels.append(boxes)
+        while len(boxes) > 1:
+            pairs = np.arange(0, len(boxes), 2)
+            boxes = np.hstack([np.minimum.reduceat(boxes[:, :3], pairs), np.maximum.reduceat(boxes[:, 3:], pairs)])
+            self.levels.append(boxes)
+        self.levels.reverse()
+
+        # The top levels are small enough to test in one go, so queries start at the first wide level
+        self._first_level = next((depth for depth, level in enumerate(self.levels) if len(level) >= self.FIRST_LEVEL_SIZE), len(self.levels) - 1)
+
+    @staticmethod
+    def _morton_order(triangles: np.ndarray) -> np.ndarray:
+        centers = triangles[:, :, :2].mean(axis=1)
+        lo, hi = centers.min(axis=0), centers.max(axis=0)
+        cells = ((centers - lo) / np.maximum(hi - lo, 1e-9) * 1023).astype(np.uint32)
+
+        def spread(v: np.ndarray) -> np.ndarray:
+            # Puts a zero bit between each of the 10 low bits
+            v = (v | (v << 8)) & 0x00FF00FF
+            v = (v | (v << 4)) & 0x0F0F0F0F
+            v = (v | (v << 2)) & 0x33333333
+            return (v | (v << 1)) & 0x55555555
+
+        return np.argsort(spread(cells[:, 0]) | (spread(cells[:, 1]) << 1), kind="stable")
+
+    @property
+    def nbytes(self) -> int:
+        return self.triangles.nbytes + sum(level.nbytes for level in self.levels)
+
+    def heights(self, x: float, y: float, z_lo: float = -math.inf, z_hi: float = math.inf) -> np.ndarray:
+        """Heights of every walkable surface crossing the vertical line at (x, y) within [z_lo, z_hi]."""
+        if not self.levels:
+            return np.zeros(0)
+
+        query_lo = np.array([x, y, z_lo])
+        query_hi = np.array([x, y, z_hi])
+        first = self.levels[self._first_level]
+        nodes = np.flatnonzero(((first[:, :3] <= query_hi) & (first[:, 3:] >= query_lo)).all(axis=1))
+        for boxes in self.levels[self._first_level + 1:]:
+            if not len(nodes):
+                return np.zeros(0)
+            nodes = (nodes[:, None] * 2 + (0, 1)).ravel()
+            nodes = nodes[nodes < len(boxes)]
+            boxes = boxes[nodes]
+            nodes = nodes[((boxes[:, :3] <= query_hi) & (boxes[:, 3:] >= query_lo)).all(axis=1)]
+        if not len(nodes):
+            return np.zeros(0)
+
+        candidates = (nodes[:, None] * self.LEAF_SIZE + np.arange(self.LEAF_SIZE)).ravel()
+        triangles = self.triangles[candidates[candidates < len(self.triangles)]]
+
+        # Barycentric coordinates of (x, y) in each triangle's xy projection
+        a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+        denominator = (b[:, 1] - c[:, 1]) * (a[:, 0] - c[:, 0]) + (c[:, 0] - b[:, 0]) * (a[:, 1] - c[:, 1])
+        u = ((b[:, 1] - c[:, 1]) * (x - c[:, 0]) + (c[:, 0] - b[:, 0]) * (y - c[:, 1])) / denominator
+        v = ((c[:, 1] - a[:, 1]) * (x - c[:, 0]) + (a[:, 0] - c[:, 0]) * (y - c[:, 1])) / denominator
+        w = 1 - u - v
+        inside = (u >= -1e-9) & (v >= -1e-9) & (w >= -1e-9)
+
+        z = (u * a[:, 2] + v * b[:, 2] + w * c[:, 2])[inside]
+        return z[(z >= z_lo) & (z <= z_hi)]
+
+    def floor_below(self, x: float, y: float, z0: float) -> Optional[float]:
+        """First walkable surface hit by a ray cast down from z0, or None."""
+        heights = self.heights(x, y, z_hi=z0)
+        return float(heights.max()) if len(heights) else None
+
+    def floor_above(self, x: float, y: float, z0: float) -> Optional[float]:
+        """First walkable surface hit by a ray cast up from z0, or None."""
+        heights = self.heights(x, y, z_lo=z0)
+        return float(heights.min()) if len(heights) else None
+
+    def snap_z(self, x: float, y: float, z0: float, step_up: float = 0.0) -> float:
+        """
+        Height to stand at near z0: the floor below z0 + step_up, else the nearest floor above,
+        else z0 itself when there is no walkable surface at (x, y).
+        """
+        floor = self.floor_below(x, y, z0 + step_up)
+        if floor is None:
+            floor = self.floor_above(x, y, z0 + step_up)
+        return z0 if floor is None else floor
+
+
+def build_mesh_shapes(world: "ColumnarWorld | CollisionWorld", z_slice: float) -> List[Polygon]:
+    """Build 2D walkable mesh shapes from the collision world around the given height"""
+    return WalkableTriangles(world).shapes_between(
+        z_slice - collision_config["walkable_below"], z_slice + collision_config["walkable_above"]
+    )
 
-    for obj in world.objects:
+
+class CollisionPrewarmer:
+    """
+    Watches hooked clients for zone changes and loads the new zone's collision, plus the slice at the
+    player's height, before the first teleport needs it. Prewarms are shared between clients entering
+    the same zone, and are cancelled once no watched client is left in that zone.
+    """
+    def __init__(self, poll_interval: float):
+        self.poll_interval = poll_interval
+        self._watchers: dict[Client, asyncio.Task] = {}
+        self._client_keys: dict[Client, tuple[str, str]] = {}
+        self._prewarms: dict[tuple[str, str], asyncio.Task] = {}
+
+    def watch(self, client: Client):
+        if not collision_config["prewarm"] or client in self._watchers:
+            return
+        self._watchers[client] = asyncio.ensure_future(self._watch(client))
+
+    def unwatch(self, client: Client):
+        watcher = self._watchers.pop(client, None)
+        if watcher is not None:
+            watcher.cancel()
+        self._leave_zone(client)
+        # Unwatched clients are being closed, and a new game process may be a patched one
+        _client_revisions.pop(client, None)
+
+    def stop(self):
+        for client in list(self._watchers):
+            self.unwatch(client)
+
+    def _leave_zone(self, client: Client):
+        key = self._client_keys.pop(client, None)
+        if key is None or key in self._client_keys.values():
+            return
+        prewarm = self._prewarms.pop(key, None)
+        if prewarm is not None and not prewarm.done():
+            logger.debug(f"Cancelling collision prewarm for {key[1]}.")
+            prewarm.cancel()
+
+    async def _watch(self, client: Client):
+        last_zone = None
+        while True:
+            try:
+                if not await client.is_loading():
+                    zone_name = await client.zone_name()
+                    if zone_name and zone_name != last_zone:
+                        last_zone = zone_name
+                        await self._zone_changed(client)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.debug(f"Collision prewarm watcher for {client.title} failed to poll: {e}")
+
+            await asyncio.sleep(self.poll_interval)
+
+    async def _zone_changed(self, client: Client):
+        key = await _zone_key(client)
+        if self._client_keys.get(client) != key:
+            self._leave_zone(client)
+            self._client_keys[client] = key
+
+        prewarm = self._prewarms.get(key)
+        if prewarm is not None and not prewarm.done():
+            return
+        self._prewarms[key] = asyncio.ensure_future(self._prewarm(client, key))
+
+    async def _still_wanted(self, client: Client, key: tuple[str, str]) -> bool:
+        """False once the prewarm is cancelled or the client has left the zone it was started for."""
+        task = asyncio.current_task()
+        if (task is not None and task.cancelling()) or self._client_keys.get(client) != key:
+            return False
         try:
-            if obj.proxy == ProxyType.BOX:
-                l, w, h = obj.params.length, obj.params.width, obj.params.depth
-                if obj.location[2] - h / 2 <= z_slice <= obj.location[2] + h / 2:
-                    verts = toCubeVertices((l, w, h))
-                    world_pts = transformCube(verts, obj.location, obj.rotation)
-                    pts2d = [(p[0], p[1]) for p in world_pts]
-                    if len(pts2d) >= 3:
-                        shapes.append(Polygon(pts2d).convex_hull)
-
-            elif obj.proxy == ProxyType.SPHERE:
-                scale_val = obj.scale if isinstance(obj.scale, (float, int)) else obj.scale[0]
-                r = obj.params.radius * scale_val
-                if r > 0 and abs(z_slice - obj.location[2]) <= r:
-                    shapes.append(Point(obj.location[0], obj.location[1]).buffer(r))
-
-            elif obj.proxy == ProxyType.CYLINDER:
-                if isinstance(obj.scale, (float, int)):
-                    scale_xy, scale_z = obj.scale, obj.scale
-                else:
-                    scale_xy, scale_z = obj.scale[0], obj.scale[2]
-
-                scaled_half_length = (obj.params.length / 2) * scale_z
-                scaled_radius = obj.params.radius * scale_xy * 0.125
-                if scaled_radius > 0 and obj.location[2] - scaled_half_length <= z_slice <= obj.location[2] + scaled_half_length:
-                    shapes.append(Point(obj.location[0], obj.location[1]).buffer(scaled_radius))
+            return await client.zone_name() == key[1]
+        except Exception:
+            return False
 
+    async def _prewarm(self, client: Client, key: tuple[str, str]):
+        start = time.perf_counter()
+        try:
+            player_z = (await client.body.position()).z
+            # Slices simplify by a fraction of the radius of whoever builds them first
+            _, player_radius = await _player_radius(client)
+
+            # Cancelling only abandons the await, so work for a zone already left is never started
+            still_wanted = lambda: self._still_wanted(client, key)
+            request = GeometryRequest(key, player_z, player_radius=player_radius)
+            if collision_config["geometry_process_pool"]:
+                # The teleport geometry lives in the worker, so that is the cache to warm
+                if (await solve_geometry(client, request, still_wanted)).status == "skipped":
+                    return
+            else:
+                zone = collision_cache.get(key)
+                if zone is None:
+                    if not await still_wanted():
+                        return
+                    zone = await _start_zone_load(client, key)
+
+                if zone.slice_key(player_z) not in zone.slices:
+                    if not await still_wanted():
+                        return
+                    await _solve_zone_locked(zone, request)
+                    collision_cache.put(key, zone)
+
+            logger.debug(f"Prewarmed collision for {key[1]} in {(time.perf_counter() - start) * 1000:.0f} ms.")
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            logger.debug(f"Error processing collision object '{obj.name}': {e}")
-            continue
-
-    return shapes
+            logger.error(f"Collision prewarm for {key[1]} failed: {e}")
 
 
-def build_mesh_shapes(world: CollisionWorld, z_slice: float) -> List[Polygon]:
-    """Build 2D mesh shapes from the collision world"""
-    shapes = []
-    for obj in world.objects:
-        if obj.proxy == ProxyType.MESH:
-            pts3d = transformCube(obj.vertices, obj.location, obj.rotation)
-            pts2d = [(x, y) for x, y, z in pts3d]
-            if len(pts2d) >= 3:
-                shapes.append(Polygon(pts2d).convex_hull)
-    return shapes
+collision_prewarmer = CollisionPrewarmer(collision_config["prewarm_interval"])
 
 
 async def try_navmap_fallback(client: Client, xyz: XYZ, sigma: float = 5.0) -> bool:
-    """Fallback to navmap teleportation if WorldsCollideTP fails"""
-    from src.teleport_math import calc_Distance, navmap_tp
+    """Fallback to teleporting along a navigation path if WorldsCollideTP fails"""
     start_zone = await client.zone_name()
     start_pos = await client.body.position()
 
-    logger.debug(f"Calling navmap_tp fallback to {xyz}")
-    await navmap_tp(client, xyz)
+    logger.debug(f"Calling navigation fallback to {xyz}")
+    base_player_radius, player_radius = await _player_radius(client)
+    await navigate_to(client, xyz, player_radius, base_player_radius)
     await asyncio.sleep(1)
 
     curr_pos = await client.body.position()
     curr_zone = await client.zone_name()
-    moved = calc_Distance(start_pos, curr_pos) > sigma
+    moved = math.dist((start_pos.x, start_pos.y, start_pos.z), (curr_pos.x, curr_pos.y, curr_pos.z)) > sigma
     zone_changed = (curr_zone != start_zone)
     still_free = await is_free(client)
 
-    logger.debug(f"Navmap result: moved={moved}, zone_changed={zone_changed}, still_free={still_free}")
-    return (moved or zone_changed or not still_free)
\ No newline at end of file
+    logger.debug(f"Navigation result: moved={moved}, zone_changed={zone_changed}, still_free={still_free}")
+    return (moved or zone_changed or not still_free)
+
+
+def benchmark_zone(
+        raw_data: bytes,
+        heights: tuple[float, ...] = (50.0,),
+        repeat: int = 3,
+        player_radius: float = 25.0
+) -> dict[str, float]:
+    """
+    Times the offline collision pipeline on raw collision data: parsing into objects and into columns,
+    building each height's slice for player_radius and its whole-slice unions. Returns the best time in
+    seconds per stage over repeat runs (slices and unions summed over the heights). Results are logged
+    as well, followed by each slice's union vertex counts before and after simplification.
+    """
+    stages = ("parse_objects", "parse_columnar", "slice", "union")
+    timings = dict.fromkeys(stages, math.inf)
+    for _ in range(repeat):
+        start = time.perf_counter()
+        CollisionWorld().load(raw_data, **_world_filter())
+        timings["parse_objects"] = min(timings["parse_objects"], time.perf_counter() - start)
+
+        start = time.perf_counter()
+        zone = ZoneCollision(_parse_collision_world(raw_data))
+        timings["parse_columnar"] = min(timings["parse_columnar"], time.perf_counter() - start)
+
+        slice_time = union_time = 0.0
+        for height in heights:
+            start = time.perf_counter()
+            coll_slice = zone.slice_at(height, player_radius)
+            slice_time += time.perf_counter() - start
+            start = time.perf_counter()
+            coll_slice.free_area
+            union_time += time.perf_counter() - start
+        timings["slice"] = min(timings["slice"], slice_time)
+        timings["union"] = min(timings["union"], union_time)
+
+    megabytes = len(raw_data) / 1e6
+    logger.info(
+        f"{megabytes:.1f} MB, {len(zone.world)} objects, {len(zone.walkable.triangles)} walkable triangles: "
+        f"parse {timings['parse_objects'] * 1000:.0f} ms as objects ({megabytes / timings['parse_objects']:.0f} MB/s), "
+        f"{timings['parse_columnar'] * 1000:.0f} ms as columns ({megabytes / timings['parse_columnar']:.0f} MB/s), "
+        f"slice {timings['slice'] * 1000:.0f} ms, union {timings['union'] * 1000:.0f} ms"
+    )
+    zone.vertex_report()
+    return timings
+
+
+async def prebake_game_data(patterns: Iterable[str] = (), force: bool = False) -> list[str]:
+    """
+    Compiles the disk cache for every zone in the game data directory matching one of the fnmatch
+    patterns (all zones when there are none), so clients only ever memory-map them. Zones already
+    cached are skipped unless force is set; wads without a collision.bcd are skipped too.
+    Returns the zone names that were compiled.
+    """
+    revision = game_data_revision()
+    if not _use_disk_cache(revision):
+        raise RuntimeError("Prebaking needs disk_cache enabled and a revision.dat in game_data_dir.")
+
+    patterns = list(patterns)
+    compiled = []
+    for zone_name in game_data_zones():
+        if patterns and not any(fnmatch(zone_name, pattern) for pattern in patterns):
+            continue
+        key = (revision, zone_name)
+        try:
+            raw = await get_collision_data(zone_name=zone_name)
+        except Exception as e:
+            logger.debug(f"Skipping {zone_name}: {e}")
+            continue
+        if not force and _load_cached_world(key, CollisionDiskCache.content_hash(raw)) is not None:
+            continue
+        start = time.perf_counter()
+        _compile_world(key, raw)
+        logger.info(f"Compiled {zone_name} ({len(raw) / 1e6:.1f} MB) in {time.perf_counter() - start:.2f} s")
+        compiled.append(zone_name)
+    return compiled
+
+
+def _main(argv: list[str] = None) -> int:
+    """Offline tools for collision.bcd files, usable without the game running."""
+    parser = argparse.ArgumentParser(prog="worlds_collide", description=_main.__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    synth = commands.add_parser(
+        "synth", help="write a synthetic zone as a collision.bcd file, after checking that it round-trips"
+    )
+    synth.add_argument("output", type=Path)
+    synth.add_argument("--boxes", type=int, default=2000)
+    synth.add_argument("--spheres", type=int, default=500)
+    synth.add_argument("--cylinders", type=int, default=500)
+    synth.add_argument("--meshes", type=int, default=2)
+    synth.add_argument("--mesh-triangles", type=int, default=50000)
+    synth.add_argument("--triggers", type=int, default=0)
+    synth.add_argument("--seed", type=int, default=0)
+    synth.add_argument("--no-check", action="store_true", help="skip the round-trip check")
+
+    round_trip = commands.add_parser("roundtrip", help="check that files are written back byte for byte")
+    round_trip.add_argument("files", type=Path, nargs="+")
+
+    bench = commands.add_parser("bench", help="time parsing, slicing and unions of a collision.bcd file")
+    bench_source = bench.add_mutually_exclusive_group(required=True)
+    bench_source.add_argument("file", type=Path, nargs="?")
+    bench_source.add_argument("--zone", help="a zone in game_data_dir instead of a file")
+    bench.add_argument("--heights", type=float, nargs="+", default=[50.0])
+    bench.add_argument("--repeat", type=int, default=3)
+    bench.add_argument("--radius", type=float, default=25.0, help="player radius the slices are built for")
+    bench.add_argument("--simplify", type=float, help="simplify_tolerance to use instead of config.ini's")
+
+    prebake = commands.add_parser("prebake", help="compile the disk cache for the zones in game_data_dir")
+    prebake.add_argument("zones", nargs="*", help="fnmatch patterns of zone names, all zones by default")
+    prebake.add_argument("--force", action="store_true", help="recompile zones that are already cached")
+
+    args = parser.parse_args(argv)
+    if args.command == "synth":
+        world = synthetic_world(
+            args.boxes, args.spheres, args.cylinders, args.meshes, args.mesh_triangles, args.triggers, seed=args.seed
+        )
+        raw = world_to_bcd(world)
+        if not args.no_check and not bcd_round_trip(raw):
+            logger.error("The synthetic zone does not round-trip, not writing it")
+            return 1
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_bytes(raw)
+        logger.info(f"Wrote {len(world)} objects to {args.output}")
+    elif args.command == "roundtrip":
+        failed = [path for path in args.files if not bcd_round_trip(path.read_bytes())]
+        for path in failed:
+            logger.error(f"{path} does not round-trip")
+        logger.info(f"{len(args.files) - len(failed)}/{len(args.files)} files round-trip")
+        return 1 if failed else 0
+    elif args.command == "bench":
+        raw = asyncio.run(get_collision_data(zone_name=args.zone)) if args.zone else args.file.read_bytes()
+        if args.simplify is not None:
+            collision_config["simplify_tolerance"] = args.simplify
+        benchmark_zone(raw, tuple(args.heights), args.repeat, args.radius)
+    elif args.command == "prebake":
+        compiled = asyncio.run(prebake_game_data(args.zones, args.force))
+        logger.info(f"Compiled {len(compiled)} zones into {collision_disk_cache.cache_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main())